@@ -143,6 +143,11 @@ class TextDocument:
         with self._lock:
             return self._text
 
+    @property
+    def modified(self) -> bool:
+        with self._lock:
+            return self._text != self._orig_text
+
     def save(self, version: Optional[int], text: Optional[str]) -> None:
         self.apply_full_change(version, text, save=True)
 
@@ -2,6 +2,7 @@
 import dataclasses
 import enum
 import functools
+import importlib
 import inspect
 import itertools
 import json
@@ -31,6 +32,8 @@ __all__ = [
     "to_snake_case",
     "to_camel_case",
     "as_json",
+    "as_json_bytes",
+    "json_loads",
     "from_dict",
     "from_json",
     "as_dict",
@@ -193,6 +196,44 @@ def as_json(obj: Any, indent: Optional[bool] = None, compact: Optional[bool] = N
     )
 
 
+def _import_orjson() -> Any:
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+# orjson is optional, `as_json_bytes` and `json_loads` fall back to the stdlib json module without it
+_orjson = _import_orjson()
+
+
+def as_json_bytes(obj: Any) -> bytes:
+    if _orjson is not None:
+        try:
+            return cast(
+                bytes,
+                _orjson.dumps(
+                    obj, default=_default, option=_orjson.OPT_PASSTHROUGH_DATACLASS | _orjson.OPT_NON_STR_KEYS
+                ),
+            )
+        except TypeError:
+            # e.g. integers orjson can't represent, the stdlib encoder handles them
+            pass
+
+    return as_json(obj, compact=True).encode("utf-8")
+
+
+def json_loads(s: Union[str, bytes]) -> Any:
+    if _orjson is not None:
+        try:
+            return _orjson.loads(s)
+        except ValueError:
+            # let the stdlib decoder accept or report what orjson rejects
+            pass
+
+    return json.loads(s)
+
+
 class NamedTypeError(TypeError):
     def __init__(self, name: str, message: str) -> None:
         super().__init__(f'Invalid value for "{name}": {message}')
@@ -2,12 +2,36 @@ import functools
 import os
 import re
 import sys
+import threading
+import weakref
+from collections import deque
 from pathlib import Path, PurePath
-from typing import Any, Iterable, Iterator, Optional, Sequence, Union, cast
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+_GLOB_PATTERN_CACHE_SIZE = int(os.environ.get("ROBOTCODE_GLOB_PATTERN_CACHE_SIZE", "4096"))
+
+_GLOB_PATTERN_FLAGS = re.MULTILINE | re.DOTALL
+
+
+def _is_hyperscan_enabled() -> bool:
+    if os.environ.get("ROBOTCODE_HYPERSCAN", "0").lower() not in ("1", "true"):
+        return False
+
+    try:
+        __import__("hyperscan")
+    except ImportError:
+        return False
+    return True
+
+
+_USE_HYPERSCAN = _is_hyperscan_enabled()
+
+
+_GLOBSTAR_RE = "((?:[^/]*(?:/|$))*)"
 
 
 def _glob_pattern_to_re(pattern: str) -> str:
-    result = "(?ms)^"
+    result = ""
 
     in_group = False
 
@@ -46,7 +70,7 @@ def _glob_pattern_to_re(pattern: str) -> str:
             )
 
             if is_globstar:
-                result += "((?:[^/]*(?:/|$))*)"
+                result += _GLOBSTAR_RE
                 i += 1
             else:
                 result += "([^/]*)"
@@ -55,18 +79,37 @@ def _glob_pattern_to_re(pattern: str) -> str:
 
         i += 1
 
-    result += "$"
-
     return result
 
 
-@functools.lru_cache(maxsize=256)
+@functools.lru_cache(maxsize=_GLOB_PATTERN_CACHE_SIZE)
 def _compile_glob_pattern(pattern: str) -> "re.Pattern[str]":
-    return re.compile(_glob_pattern_to_re(pattern))
+    return re.compile(_glob_pattern_to_re(pattern), _GLOB_PATTERN_FLAGS)
+
+
+def _is_glob_pattern(pattern: str) -> bool:
+    return "*" in pattern or "?" in pattern or "[" in pattern or "{" in pattern
 
 
 class Pattern:
-    def __init__(self, pattern: str) -> None:
+    only_dirs: bool
+    pattern: str
+    re_pattern: Optional["re.Pattern[str]"]
+
+    def __new__(cls, pattern: str) -> "Pattern":
+        result = _WELL_KNOWN_PATTERNS.get(pattern)
+        if result is not None and type(result) is cls:
+            return result
+
+        result = _pattern_intern.get(pattern)
+        if result is None or type(result) is not cls:
+            result = super().__new__(cls)
+            result._init(pattern)
+            _pattern_intern[pattern] = result
+
+        return result
+
+    def _init(self, pattern: str) -> None:
         pattern = pattern.strip()
 
         self.only_dirs = pattern.endswith("/")
@@ -77,11 +120,15 @@ class Pattern:
         else:
             self.pattern = path.as_posix()
 
-        if "*" in self.pattern or "?" in self.pattern or "[" in self.pattern or "{" in self.pattern:
-            self.re_pattern: Optional[re.Pattern[str]] = _compile_glob_pattern(self.pattern)
+        if _is_glob_pattern(self.pattern):
+            self.re_pattern = _compile_glob_pattern(self.pattern)
         else:
             self.re_pattern = None
 
+    @classmethod
+    def from_many(cls, patterns: Iterable[Union["Pattern", str]]) -> List["Pattern"]:
+        return [p if isinstance(p, Pattern) else cls(p) for p in patterns]
+
     def matches(self, path: Union[PurePath, str, "os.PathLike[str]"]) -> bool:
         if isinstance(path, PurePath):
             path = path.as_posix()
@@ -99,6 +146,150 @@ class Pattern:
         return f"{type(self).__qualname__}(pattern={self.pattern!r}"
 
 
+_pattern_intern: "weakref.WeakValueDictionary[str, Pattern]" = weakref.WeakValueDictionary()
+
+_HOT_GLOBS = ("**/*.robot", "**/*.resource", ".git/**", "node_modules/**", "__pycache__/**", ".venv/**")
+
+_WELL_KNOWN_PATTERNS: Dict[str, Pattern] = {}
+_WELL_KNOWN_PATTERNS.update((p, Pattern(p)) for p in _HOT_GLOBS)
+
+
+def _literal_suffix(pattern: str) -> Optional[str]:
+    if pattern.startswith("**/"):
+        suffix = pattern[3:]
+        if suffix and not suffix.startswith("/") and not _is_glob_pattern(suffix):
+            return suffix
+
+    return None
+
+
+def _build_suffix_index(suffixes: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    result: Dict[str, List[str]] = {}
+    for suffix in suffixes:
+        result.setdefault(suffix.rsplit("/", 1)[-1], []).append(suffix)
+
+    return {name: tuple(v) for name, v in result.items()}
+
+
+def _matches_suffix(path: str, suffixes: Tuple[str, ...]) -> bool:
+    for suffix in suffixes:
+        if path == suffix or (path.endswith(suffix) and path[-len(suffix) - 1] == "/"):
+            return True
+
+    return False
+
+
+def _to_hyperscan_expression(source: str) -> bytes:
+    # hyperscan does not support embedded end anchors, a trailing globstar matches everything
+    # and in the middle of a pattern it can only match complete path segments
+    if source.endswith(_GLOBSTAR_RE):
+        source = source[: -len(_GLOBSTAR_RE)] + "(.*)"
+    source = source.replace(_GLOBSTAR_RE, "((?:[^/]*/)*)")
+
+    return f"^(?:{source})$".encode()
+
+
+class _HyperscanMatcher:
+    def __init__(self, sources: Sequence[str]) -> None:
+        import hyperscan
+
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=[_to_hyperscan_expression(s) for s in sources],
+            ids=list(range(len(sources))),
+            elements=len(sources),
+            flags=[hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY]
+            * len(sources),
+        )
+        self._local = threading.local()
+
+    def fullmatch(self, path: str) -> Optional[int]:
+        import hyperscan
+
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._database)
+
+        matches: List[int] = []
+
+        def on_match(id: int, start: int, end: int, flags: int, context: Any) -> None:
+            matches.append(id)
+
+        self._database.scan(path.encode(), match_event_handler=on_match, scratch=scratch)
+
+        return matches[0] if matches else None
+
+
+def _combine_re_sources(sources: Sequence[str]) -> Optional[Callable[[str], Any]]:
+    if not sources:
+        return None
+
+    if _USE_HYPERSCAN:
+        return _HyperscanMatcher(sources).fullmatch
+
+    return re.compile("|".join(f"(?:{s})" for s in sources), _GLOB_PATTERN_FLAGS).fullmatch
+
+
+class CompiledPatternSet:
+    def __init__(self, patterns: Sequence[Tuple[str, bool]]) -> None:
+        paths: Set[str] = set()
+        dir_paths: Set[str] = set()
+        suffixes: Set[str] = set()
+        dir_suffixes: Set[str] = set()
+        sources: List[Tuple[str, bool]] = []
+
+        for pattern, only_dirs in patterns:
+            if not _is_glob_pattern(pattern):
+                (dir_paths if only_dirs else paths).add(pattern)
+                continue
+
+            suffix = _literal_suffix(pattern)
+            if suffix is not None:
+                (dir_suffixes if only_dirs else suffixes).add(suffix)
+                continue
+
+            sources.append((_compile_glob_pattern(pattern).pattern, only_dirs))
+
+        self._any_paths = frozenset(paths)
+        self._dir_paths = frozenset(paths | dir_paths)
+        # literal "**/..." patterns indexed by their last path segment, so only entries with a
+        # matching name need a suffix comparison
+        self._any_suffixes = _build_suffix_index(suffixes)
+        self._dir_suffixes = _build_suffix_index(suffixes | dir_suffixes)
+        self._any_match = _combine_re_sources([s for s, only_dirs in sources if not only_dirs])
+        self._dir_match = _combine_re_sources([s for s, _ in sources])
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[Pattern]) -> "CompiledPatternSet":
+        return _compile_pattern_set(tuple((p.pattern, p.only_dirs) for p in patterns))
+
+    def __bool__(self) -> bool:
+        return bool(self._dir_paths or self._dir_suffixes or self._dir_match is not None)
+
+    def matches(self, path: str, name: str, is_dir: bool) -> bool:
+        if is_dir:
+            paths, suffix_index, match = self._dir_paths, self._dir_suffixes, self._dir_match
+        else:
+            paths, suffix_index, match = self._any_paths, self._any_suffixes, self._any_match
+
+        if path in paths:
+            return True
+
+        suffixes = suffix_index.get(name)
+        if suffixes is not None and _matches_suffix(path, suffixes):
+            return True
+
+        if match is None:
+            return False
+
+        return match(path) is not None
+
+
+@functools.lru_cache(maxsize=_GLOB_PATTERN_CACHE_SIZE)
+def _compile_pattern_set(patterns: Tuple[Tuple[str, bool], ...]) -> CompiledPatternSet:
+    return CompiledPatternSet(patterns)
+
+
 def globmatches(pattern: str, path: Union[PurePath, str, "os.PathLike[Any]"]) -> bool:
     return Pattern(pattern).matches(path)
 
@@ -106,14 +297,12 @@ def globmatches(pattern: str, path: Union[PurePath, str, "os.PathLike[Any]"]) ->
 FILE_ATTRIBUTE_HIDDEN = 2
 
 
-def _is_hidden(entry: "os.DirEntry[str]") -> bool:
-    if entry.name.startswith("."):
+def _is_hidden(entry: "os.DirEntry[str]", check_hidden_attribute: bool = False) -> bool:
+    if entry.name[:1] == "." or (sys.platform == "win32" and entry.name[:1] == "$"):
         return True
 
-    if sys.platform == "win32" and (
-        (not entry.is_symlink() and entry.stat().st_file_attributes & 2 != 0) or entry.name.startswith("$")
-    ):
-        return True
+    if check_hidden_attribute and sys.platform == "win32":
+        return entry.stat(follow_symlinks=False).st_file_attributes & FILE_ATTRIBUTE_HIDDEN != 0
 
     return False
 
@@ -124,8 +313,14 @@ def iter_files(
     ignore_patterns: Union[Sequence[Union[Pattern, str]], Pattern, str, None] = None,
     *,
     include_hidden: bool = False,
+    check_hidden_attribute: bool = False,
     absolute: bool = False,
 ) -> Iterator[Path]:
+    """Iterates over all files and directories below `path` that match the given patterns.
+
+    Entries whose names start with `.` (or `$` on Windows) are treated as hidden. The Windows
+    `FILE_ATTRIBUTE_HIDDEN` flag is only evaluated if `check_hidden_attribute` is set.
+    """
     if not isinstance(path, PurePath):
         path = PurePath(path or ".")
 
@@ -135,52 +330,48 @@ def iter_files(
     if ignore_patterns is not None and isinstance(ignore_patterns, (str, Pattern)):
         ignore_patterns = [ignore_patterns]
 
-    yield from _iter_files_recursive_re(
-        path=path,
-        patterns=[] if patterns is None else [p if isinstance(p, Pattern) else Pattern(p) for p in patterns],
-        ignore_patterns=(
-            [] if ignore_patterns is None else [p if isinstance(p, Pattern) else Pattern(p) for p in ignore_patterns]
-        ),
+    yield from _iter_files_impl(
+        path,
+        CompiledPatternSet.from_patterns(Pattern.from_many(patterns or [])),
+        CompiledPatternSet.from_patterns(Pattern.from_many(ignore_patterns or [])),
         include_hidden=include_hidden,
+        check_hidden_attribute=check_hidden_attribute,
         absolute=absolute,
-        _base_path=path,
     )
 
 
-def _iter_files_recursive_re(
-    path: PurePath,
-    patterns: Sequence[Pattern],
-    ignore_patterns: Sequence[Pattern],
+def _iter_files_impl(
+    root: PurePath,
+    patterns: CompiledPatternSet,
+    ignore_patterns: CompiledPatternSet,
     include_hidden: bool,
+    check_hidden_attribute: bool,
     absolute: bool,
-    _base_path: PurePath,
 ) -> Iterator[Path]:
-    try:
-        with os.scandir(path) as it:
-            for f in it:
-                if not include_hidden and _is_hidden(f):
-                    continue
-
-                relative_path = (path / f.name).relative_to(_base_path)
-
-                if not ignore_patterns or not any(
-                    p.matches(relative_path) and (not p.only_dirs or p.only_dirs and f.is_dir())
-                    for p in cast(Iterable[Pattern], ignore_patterns)
-                ):
-                    if f.is_dir():
-                        yield from _iter_files_recursive_re(
-                            PurePath(f),
-                            patterns,
-                            ignore_patterns,
-                            include_hidden=include_hidden,
-                            absolute=absolute,
-                            _base_path=_base_path,
-                        )
-                    if not patterns or any(
-                        p.matches(relative_path) and (not p.only_dirs or p.only_dirs and f.is_dir())
-                        for p in cast(Iterable[Pattern], patterns)
-                    ):
-                        yield Path(f).absolute() if absolute else Path(f)
-
-    except (OSError, PermissionError):
-        pass
+    stack: Deque[Tuple[str, str]] = deque([(os.fspath(root), "")])
+
+    while stack:
+        path, relative_prefix = stack.pop()
+
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except (OSError, PermissionError):
+            continue
+
+        for f in entries:
+            if not include_hidden and _is_hidden(f, check_hidden_attribute):
+                continue
+
+            name = f.name
+            relative_path = relative_prefix + name
+            is_dir = f.is_dir()
+
+            if ignore_patterns.matches(relative_path, name, is_dir):
+                continue
+
+            if is_dir:
+                stack.append((f.path, relative_path + "/"))
+
+            if not patterns or patterns.matches(relative_path, name, is_dir):
+                yield Path(f.path).absolute() if absolute else Path(f.path)
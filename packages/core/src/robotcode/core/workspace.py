@@ -1,3 +1,5 @@
+import functools
+import os
 import threading
 from typing import (
     Any,
@@ -6,6 +8,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -13,7 +16,6 @@ from typing import (
 
 from robotcode.core.uri import Uri
 from robotcode.core.utils.dataclasses import CamelSnakeMixin, from_dict
-from robotcode.core.utils.path import path_is_relative_to
 
 
 class WorkspaceFolder:
@@ -23,6 +25,13 @@ class WorkspaceFolder:
         self.uri = uri
 
 
+# the document uris of the open documents are resolved to a workspace folder by many handlers on every change,
+# the path of an uri string never changes, so the parsing is done only once per uri
+@functools.lru_cache(maxsize=4096)
+def _uri_str_to_normcase_path(uri: str) -> str:
+    return os.path.normcase(str(Uri(uri).to_path()))
+
+
 _F = TypeVar("_F", bound=Callable[..., Any])
 
 
@@ -55,6 +64,7 @@ class Workspace:
 
         self._workspace_folders_lock = threading.RLock()
         self._workspace_folders: List[WorkspaceFolder] = workspace_folders if workspace_folders else []
+        self._workspace_folders_index: Optional[List[Tuple[str, WorkspaceFolder]]] = None
 
     @property
     def workspace_folders(self) -> List[WorkspaceFolder]:
@@ -84,17 +94,28 @@ class Workspace:
 
         return from_dict(result if result else {}, section)
 
-    def get_workspace_folder(self, uri: Union[Uri, str]) -> Optional[WorkspaceFolder]:
-        if isinstance(uri, str):
-            uri = Uri(uri)
+    def workspace_folders_changed(self) -> None:
+        with self._workspace_folders_lock:
+            self._workspace_folders_index = None
 
-        result = sorted(
-            [f for f in self.workspace_folders if path_is_relative_to(uri.to_path(), f.uri.to_path())],
-            key=lambda v1: len(v1.uri),
-            reverse=True,
-        )
+    def _get_workspace_folders_index(self) -> List[Tuple[str, WorkspaceFolder]]:
+        with self._workspace_folders_lock:
+            if self._workspace_folders_index is None:
+                self._workspace_folders_index = sorted(
+                    ((os.path.normcase(str(f.uri.to_path())), f) for f in self._workspace_folders),
+                    key=lambda v: len(v[0]),
+                    reverse=True,
+                )
+
+            return self._workspace_folders_index
+
+    def get_workspace_folder(self, uri: Union[Uri, str]) -> Optional[WorkspaceFolder]:
+        path = _uri_str_to_normcase_path(uri) if isinstance(uri, str) else os.path.normcase(str(uri.to_path()))
 
-        if len(result) > 0:
-            return result[0]
+        for folder_path, folder in self._get_workspace_folders_index():
+            if path == folder_path or path.startswith(
+                folder_path if folder_path.endswith(os.sep) else folder_path + os.sep
+            ):
+                return folder
 
         return None
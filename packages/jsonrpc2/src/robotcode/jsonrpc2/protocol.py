@@ -3,12 +3,10 @@ from __future__ import annotations
 import asyncio
 import functools
 import inspect
-import json
-import re
+import itertools
 import threading
 import weakref
 from abc import ABC, abstractmethod
-from collections import OrderedDict
 from dataclasses import dataclass, field, fields, is_dataclass
 from typing import (
     Any,
@@ -16,10 +14,12 @@ from typing import (
     ClassVar,
     Dict,
     Final,
+    FrozenSet,
     Generic,
     Iterator,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Protocol,
     Set,
@@ -35,8 +35,7 @@ from typing import (
 from robotcode.core.async_tools import run_coroutine_in_thread
 from robotcode.core.concurrent import Task, run_as_task
 from robotcode.core.event import event
-from robotcode.core.utils.dataclasses import as_json, from_dict
-from robotcode.core.utils.inspect import ensure_coroutine, iter_methods
+from robotcode.core.utils.dataclasses import as_json_bytes, from_dict, json_loads
 from robotcode.core.utils.logging import LoggingDescriptor
 
 __all__ = [
@@ -120,6 +119,41 @@ class JsonRPCError(_JsonRPCResponseBase):
     result: Optional[Any] = None
 
 
+# the wire shape of the message types is fixed, build it directly instead of reflecting over the dataclass fields
+# for every message, `None` values of fields with a default are left out like `as_json` does
+def _request_to_wire(m: JsonRPCRequest) -> Dict[str, Any]:
+    if m.params is None:
+        return {"jsonrpc": PROTOCOL_VERSION, "id": m.id, "method": m.method}
+    return {"jsonrpc": PROTOCOL_VERSION, "id": m.id, "method": m.method, "params": m.params}
+
+
+def _notification_to_wire(m: JsonRPCNotification) -> Dict[str, Any]:
+    if m.params is None:
+        return {"jsonrpc": PROTOCOL_VERSION, "method": m.method}
+    return {"jsonrpc": PROTOCOL_VERSION, "method": m.method, "params": m.params}
+
+
+def _response_to_wire(m: JsonRPCResponse) -> Dict[str, Any]:
+    return {"jsonrpc": PROTOCOL_VERSION, "id": m.id, "result": m.result}
+
+
+def _error_to_wire(m: JsonRPCError) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": m.error.code, "message": m.error.message}
+    if m.error.data is not None:
+        error["data"] = m.error.data
+    if m.result is None:
+        return {"jsonrpc": PROTOCOL_VERSION, "id": m.id, "error": error}
+    return {"jsonrpc": PROTOCOL_VERSION, "id": m.id, "error": error, "result": m.result}
+
+
+_MESSAGE_TO_WIRE: Final[Dict[Type[Any], Callable[[Any], Dict[str, Any]]]] = {
+    JsonRPCRequest: _request_to_wire,
+    JsonRPCNotification: _notification_to_wire,
+    JsonRPCResponse: _response_to_wire,
+    JsonRPCError: _error_to_wire,
+}
+
+
 class JsonRPCException(Exception):  # noqa: N818
     pass
 
@@ -157,6 +191,71 @@ class RpcMethodEntry:
         return self._is_coroutine
 
 
+class RpcParamInfo(NamedTuple):
+    # name and "is positional only" of every parameter, in signature order
+    parameters: Tuple[Tuple[str, bool], ...]
+    has_var_kw: bool
+
+    @classmethod
+    def from_callable(cls, callable: Callable[..., Any]) -> RpcParamInfo:
+        parameters = inspect.signature(callable).parameters.values()
+        return cls(
+            tuple((p.name, p.kind == inspect.Parameter.POSITIONAL_ONLY) for p in parameters),
+            any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters),
+        )
+
+
+class RpcParamPlan(NamedTuple):
+    # keyword arguments for a dataclass params type and a callable without positional only parameters
+    fields: Tuple[str, ...]
+    extra_fields: Tuple[str, ...]
+    raw: Tuple[str, ...]
+    field_names: FrozenSet[str]
+    has_params: bool
+    has_var_kw: bool
+
+    @classmethod
+    def create(cls, param_info: RpcParamInfo, field_names: Tuple[str, ...]) -> Optional[RpcParamPlan]:
+        if any(positional_only for _, positional_only in param_info.parameters):
+            return None
+
+        names = [name for name, _ in param_info.parameters]
+        field_set = frozenset(field_names)
+        return cls(
+            tuple(name for name in names if name in field_set),
+            tuple(name for name in field_names if name not in names),
+            tuple(name for name in names if name not in field_set and name != "params"),
+            field_set,
+            "params" in names and "params" not in field_set,
+            param_info.has_var_kw,
+        )
+
+    def apply(self, converted_params: Any, params: Any) -> Dict[str, Any]:
+        kw_args = {name: getattr(converted_params, name) for name in self.fields}
+        if self.has_params:
+            kw_args["params"] = converted_params
+
+        is_dict = isinstance(params, dict)
+        if is_dict:
+            for name in self.raw:
+                if name in params:
+                    kw_args[name] = params[name]
+
+        if self.has_var_kw:
+            for name in self.extra_fields:
+                kw_args[name] = getattr(converted_params, name)
+            if is_dict:
+                for name in params:
+                    if name not in self.field_names:
+                        kw_args[name] = (
+                            getattr(converted_params, name) if hasattr(converted_params, name) else params[name]
+                        )
+
+            if not self.has_params:
+                kw_args["params"] = converted_params
+        return kw_args
+
+
 @runtime_checkable
 class RpcMethod(Protocol):
     __slots__ = "__rpc_method__"
@@ -190,7 +289,7 @@ def rpc_method(
     threaded: bool = False,
 ) -> Callable[[_F], _F]:
     def _decorator(func: _F) -> Callable[[_F], _F]:
-        if inspect.isclass(_func):
+        if isinstance(_func, type):
             raise TypeError(f"Not supported type {type(func)}.")
 
         if isinstance(func, classmethod):
@@ -219,6 +318,9 @@ class HasRpcRegistry(Protocol):
 
 class RpcRegistry:
     class_registries: ClassVar[Dict[Type[Any], RpcRegistry]] = {}
+    __rpc_functions_cache: ClassVar[weakref.WeakKeyDictionary[Type[Any], Tuple[Tuple[str, RpcMethodEntry], ...]]] = (
+        weakref.WeakKeyDictionary()
+    )
 
     def __init__(self, owner: Any = None) -> None:
         self.__owner = owner
@@ -235,10 +337,12 @@ class RpcRegistry:
             return self
 
         if obj is not None:
-            if not isinstance(obj, HasRpcRegistry):
-                cast(HasRpcRegistry, obj).__rpc_registry__ = RpcRegistry(obj)
+            # a plain attribute probe, isinstance on the runtime checkable protocol is much slower
+            registry: Optional[RpcRegistry] = getattr(obj, "__rpc_registry__", None)
+            if registry is None:
+                registry = cast(HasRpcRegistry, obj).__rpc_registry__ = RpcRegistry(obj)
 
-            return cast(HasRpcRegistry, obj).__rpc_registry__
+            return registry
 
         if obj_type not in RpcRegistry.class_registries:
             RpcRegistry.class_registries[obj_type] = RpcRegistry(obj_type)
@@ -263,36 +367,46 @@ class RpcRegistry:
 
         return set(self.__class_part_instances)
 
+    @classmethod
+    def __get_rpc_functions(cls, t: Type[Any]) -> Tuple[Tuple[str, RpcMethodEntry], ...]:
+        # the rpc methods of a class don't change, so scan each class only once,
+        # and check for the marker attribute instead of the slow runtime checkable protocol
+        result = cls.__rpc_functions_cache.get(t)
+        if result is None:
+            result = cls.__rpc_functions_cache[t] = tuple(
+                (name, entry)
+                for name in dir(t)
+                if inspect.isfunction(v := getattr(t, name))
+                and isinstance(entry := getattr(v, "__rpc_method__", None), RpcMethodEntry)
+            )
+        return result
+
     def __ensure_initialized(self) -> None:
         def get_methods(obj: Any) -> Dict[str, RpcMethodEntry]:
-            return {
-                rpc_method.__rpc_method__.name: RpcMethodEntry(
-                    rpc_method.__rpc_method__.name,
-                    method,
-                    rpc_method.__rpc_method__.param_type,
-                    rpc_method.__rpc_method__.cancelable,
-                    rpc_method.__rpc_method__.threaded,
-                )
-                for method, rpc_method in map(
-                    lambda m1: (m1, cast(RpcMethod, m1)),
-                    iter_methods(
-                        obj,
-                        lambda m2: isinstance(m2, RpcMethod)
-                        or inspect.ismethod(m2)
-                        and isinstance(m2.__func__, RpcMethod),
-                    ),
+            is_cls = isinstance(obj, type)
+
+            result: Dict[str, RpcMethodEntry] = {}
+            for attr_name, entry in RpcRegistry.__get_rpc_functions(obj if is_cls else type(obj)):
+                method = getattr(obj, attr_name)
+                if not is_cls and not inspect.ismethod(method):
+                    continue
+
+                result[entry.name] = (
+                    entry
+                    if method is entry.method
+                    else RpcMethodEntry(entry.name, method, entry.param_type, entry.cancelable, entry.threaded)
                 )
-            }
+            return result
 
         if not self.__initialized:
-            if inspect.isclass(self.__owner):
+            if isinstance(self.__owner, type):
                 self.__methods = get_methods(self.__owner)
 
                 for cp in self.__class_parts.items():
                     self.__methods.update(get_methods(cp))
             else:
                 registries: List[RpcRegistry] = []
-                for m in inspect.getmro(type(self.__owner)):
+                for m in type(self.__owner).__mro__:
                     r = RpcRegistry.class_registries.get(m, None)
                     if r is not None:
                         registries.insert(0, r)
@@ -305,7 +419,7 @@ class RpcRegistry:
                 for cpi in self.__class_part_instances:
                     self.__methods.update(get_methods(cpi))
 
-        self.__initialized = True
+            self.__initialized = True
 
     def initialize_parts(self) -> None:
         self.__ensure_initialized()
@@ -333,8 +447,10 @@ class RpcRegistry:
         return self.__methods.pop(name, None)
 
     def get_entry(self, name: str) -> Optional[RpcMethodEntry]:
-        self.__ensure_initialized()
-        return self.__methods.get(name, None)
+        # called for every message, so don't pay for the call to __ensure_initialized once initialized
+        if not self.__initialized:
+            self.__ensure_initialized()
+        return self.__methods.get(name)
 
     def get_method(self, name: str) -> Optional[Callable[..., Any]]:
         result = self.get_entry(name)
@@ -379,7 +495,10 @@ class JsonRPCProtocolBase(asyncio.Protocol, ABC):
     def __init__(self) -> None:
         self.read_transport: Optional[asyncio.ReadTransport] = None
         self.write_transport: Optional[asyncio.WriteTransport] = None
-        self._message_buf = b""
+        self._message_buf = bytearray()
+        self._content_length: Optional[int] = None
+        self._charset: str = self.CHARSET
+        self._header_scan_pos = 0
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
@@ -412,35 +531,73 @@ class JsonRPCProtocolBase(asyncio.Protocol, ABC):
     CHARSET: Final = "utf-8"
     CONTENT_TYPE: Final = "application/vscode-jsonrpc"
 
-    MESSAGE_PATTERN: Final = re.compile(
-        rb"(?:[^\r\n]*\r\n)*"
-        rb"(Content-Length: ?(?P<length>\d+)\r\n)"
-        rb"((Content-Type: ?(?P<content_type>[^\r\n;]+)"
-        rb"(; *(charset=(?P<charset>[^\r\n]+))?)?\r\n)|(?:[^\r\n]+\r\n))?"
-        rb"\r\n(?P<body>.*)",
-        re.DOTALL,
-    )
-
-    def data_received(self, data: bytes) -> None:
-        while len(data):
-            # Append the incoming chunk to the message buffer
-            self._message_buf += data
-
-            # Look for the body of the message
-            found = self.MESSAGE_PATTERN.match(self._message_buf)
+    HEADER_PREFIX: Final = b"Content-Length: "
+    HEADER_SUFFIX: Final = f"\r\nContent-Type: {CONTENT_TYPE}; charset={CHARSET}\r\n\r\n".encode("ascii")
 
-            body = found.group("body") if found else b""
-            length = int(found.group("length")) if found else 1
+    HEADER_END: Final = b"\r\n\r\n"
 
-            charset = (
-                found.group("charset").decode("ascii") if found and found.group("charset") is not None else self.CHARSET
-            )
+    def _parse_headers(self, headers: bytes) -> None:
+        # most clients send nothing but the content length, int() parses the ascii bytes without a decode
+        if headers.startswith(self.HEADER_PREFIX) and b"\r\n" not in headers:
+            try:
+                self._content_length = int(headers[len(self.HEADER_PREFIX) :])
+                return
+            except ValueError:
+                pass
+
+        for line in headers.split(b"\r\n"):
+            name, sep, value = line.partition(b":")
+            if not sep:
+                continue
+
+            name = name.strip().lower()
+            if name == b"content-length":
+                try:
+                    self._content_length = int(value)
+                except ValueError:
+                    pass
+            elif name == b"content-type":
+                for param in value.split(b";")[1:]:
+                    key, _, charset = param.partition(b"=")
+                    if key.strip().lower() == b"charset" and charset.strip():
+                        self._charset = charset.strip().decode("ascii")
+
+    def _copy_from_buf(self, length: int) -> bytes:
+        # slicing the bytearray itself would create an intermediate bytearray copy,
+        # the view is released before the buffer is resized
+        with memoryview(self._message_buf) as view:
+            return view[:length].tobytes()
 
-            if len(body) < length:
+    def data_received(self, data: bytes) -> None:
+        self._message_buf.extend(data)
+
+        while True:
+            if self._content_length is None:
+                # only the header part is scanned, the body is never searched, and bytes already
+                # scanned in a previous chunk are not searched again
+                header_end = self._message_buf.find(self.HEADER_END, self._header_scan_pos)
+                if header_end < 0:
+                    self._header_scan_pos = max(0, len(self._message_buf) - len(self.HEADER_END) + 1)
+                    return
+
+                self._parse_headers(self._copy_from_buf(header_end))
+                del self._message_buf[: header_end + len(self.HEADER_END)]
+                self._header_scan_pos = 0
+
+                # a header block without a content length can't be framed, skip it
+                if self._content_length is None:
+                    continue
+
+            length = self._content_length
+            if len(self._message_buf) < length:
                 return
 
-            body, data = body[:length], body[length:]
-            self._message_buf = b""
+            body = self._copy_from_buf(length)
+            del self._message_buf[:length]
+            charset = self._charset
+
+            self._content_length = None
+            self._charset = self.CHARSET
 
             self._handle_body(body, charset)
 
@@ -448,19 +605,26 @@ class JsonRPCProtocolBase(asyncio.Protocol, ABC):
     def _handle_body(self, body: bytes, charset: str) -> None: ...
 
 
+_UTF8_CHARSETS: Final = frozenset({"utf-8", "utf8"})
+
+
 class JsonRPCProtocol(JsonRPCProtocolBase):
     __logger = LoggingDescriptor()
     _data_logger = LoggingDescriptor(postfix="_data")
 
     def __init__(self) -> None:
         super().__init__()
-        self._sended_request_lock = threading.RLock()
-        self._sended_request: OrderedDict[Union[str, int], SendedRequestEntry] = OrderedDict()
-        self._sended_request_count = 0
-        self._received_request: OrderedDict[Union[str, int, None], ReceivedRequestEntry] = OrderedDict()
-        self._received_request_lock = threading.RLock()
-        self._signature_cache: Dict[Callable[..., Any], inspect.Signature] = {}
+        self._sended_request_lock = threading.Lock()
+        self._sended_request: Dict[Union[str, int], SendedRequestEntry] = {}
+        self._sended_request_ids = itertools.count(1)
+        self._received_request: Dict[Union[str, int, None], ReceivedRequestEntry] = {}
+        self._received_request_lock = threading.Lock()
+        self._param_info_cache: Dict[Callable[..., Any], RpcParamInfo] = {}
+        self._param_plan_cache: Dict[Tuple[Callable[..., Any], Type[Any]], Optional[RpcParamPlan]] = {}
         self._running_handle_message_tasks: Set[asyncio.Future[Any]] = set()
+        self._send_queue: List[bytes] = []
+        self._send_queue_lock = threading.Lock()
+        self._send_flush_scheduled = False
 
     @staticmethod
     def _generate_json_rpc_messages_from_dict(
@@ -472,15 +636,15 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
                     raise InvalidProtocolVersionError("Invalid JSON-RPC2 protocol version.")
                 d.pop("jsonrpc")
 
-                return from_dict(
-                    d,
-                    (
-                        JsonRPCRequest,
-                        JsonRPCResponse,
-                        JsonRPCNotification,
-                        JsonRPCError,
-                    ),
-                )
+                message_type: Type[JsonRPCMessage]
+                if "method" in d:
+                    message_type = JsonRPCRequest if "id" in d else JsonRPCNotification
+                elif "error" in d:
+                    message_type = JsonRPCError
+                else:
+                    message_type = JsonRPCResponse
+
+                return from_dict(d, message_type)
 
             raise JsonRPCException("Invalid JSON-RPC2 Message")
 
@@ -492,11 +656,12 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
 
     def _handle_body(self, body: bytes, charset: str) -> None:
         try:
-            b = body.decode(charset)
+            self._data_logger.trace(lambda: f"JSON Received: {body.decode(charset)!r}")
 
-            self._data_logger.trace(lambda: f"JSON Received: {b!r}")
+            # utf-8 bytes are parsed directly, without a decoded copy of the body
+            data = json_loads(body if charset.lower() in _UTF8_CHARSETS else body.decode(charset))
 
-            self._handle_messages(self._generate_json_rpc_messages_from_dict(json.loads(b)))
+            self._handle_messages(self._generate_json_rpc_messages_from_dict(data))
         except (asyncio.CancelledError, SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -542,19 +707,30 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
     def send_message(self, message: JsonRPCMessage) -> None:
         message.jsonrpc = PROTOCOL_VERSION
 
-        body = as_json(message, compact=True).encode(self.CHARSET)
-
-        header = (
-            f"Content-Length: {len(body)}\r\nContent-Type: {self.CONTENT_TYPE}; charset={self.CHARSET}\r\n\r\n"
-        ).encode("ascii")
+        to_wire = _MESSAGE_TO_WIRE.get(type(message))
+        body = as_json_bytes(to_wire(message) if to_wire is not None else message)
 
         if self.write_transport is not None:
-            msg = header + body
+            # the header parts are written together with the body, without concatenating them first
+            msg = (self.HEADER_PREFIX, b"%d" % len(body), self.HEADER_SUFFIX, body)
 
-            self._data_logger.trace(lambda: f"JSON send: {msg.decode()!r}")
+            self._data_logger.trace(lambda: f"JSON send: {b''.join(msg).decode()!r}")
 
             if self._loop:
-                self._loop.call_soon_threadsafe(self.write_transport.write, msg)
+                # messages sent until the loop runs the flush are written with a single writelines call
+                with self._send_queue_lock:
+                    self._send_queue.extend(msg)
+                    if not self._send_flush_scheduled:
+                        self._loop.call_soon_threadsafe(self._flush_send_queue)
+                        self._send_flush_scheduled = True
+
+    def _flush_send_queue(self) -> None:
+        with self._send_queue_lock:
+            queue, self._send_queue = self._send_queue, []
+            self._send_flush_scheduled = False
+
+        if queue and self.write_transport is not None:
+            self.write_transport.writelines(queue)
 
     @__logger.call
     def send_request(
@@ -565,10 +741,10 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
     ) -> Task[_TResult]:
         result: Task[_TResult] = Task()
 
-        with self._sended_request_lock:
-            self._sended_request_count += 1
-            id = self._sended_request_count
+        # next() on itertools.count is atomic, only the dict needs the lock
+        id = next(self._sended_request_ids)
 
+        with self._sended_request_lock:
             self._sended_request[id] = SendedRequestEntry(result, return_type)
 
         request = JsonRPCRequest(id=id, method=method, params=params)
@@ -607,9 +783,11 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
 
         try:
             if not entry.future.done():
-                entry.future.set_result(
-                    from_dict(message.result, entry.result_type) if message.result is not None else None
-                )
+                result = message.result
+                # untyped results and scalars that already have the expected type need no conversion
+                if result is not None and entry.result_type is not None and type(result) is not entry.result_type:
+                    result = from_dict(result, entry.result_type)
+                entry.future.set_result(result)
             else:
                 self.__logger.warning(lambda: f"Response for {message} is already done.")
 
@@ -669,50 +847,56 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
         # try to convert the dict to correct type
         converted_params = from_dict(params, params_type)
 
-        # get the signature of the callable
-        if callable in self._signature_cache:
-            signature = self._signature_cache[callable]
-        else:
-            signature = inspect.signature(callable)
-            self._signature_cache[callable] = signature
-
-        has_var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values())
+        # get the parameters of the callable, inspect.signature is too expensive to call for every message
+        param_info = self._param_info_cache.get(callable)
+        if param_info is None:
+            param_info = self._param_info_cache[callable] = RpcParamInfo.from_callable(callable)
+
+        if is_dataclass(converted_params):
+            plan_key = (callable, type(converted_params))
+            try:
+                plan = self._param_plan_cache[plan_key]
+            except KeyError:
+                plan = self._param_plan_cache[plan_key] = RpcParamPlan.create(
+                    param_info, tuple(f.name for f in fields(converted_params))
+                )
+            if plan is not None:
+                return [], plan.apply(converted_params, params)
 
         kw_args = {}
         args = []
         params_added = False
 
         field_names = (
-            [f.name for f in fields(converted_params)]
+            {f.name for f in fields(converted_params)}
             if is_dataclass(converted_params)
-            else list(converted_params.__dict__.keys())
+            else set(converted_params.__dict__.keys())
         )
 
         rest = set(field_names)
         if isinstance(params, dict):
-            rest = set.union(rest, params.keys())
+            rest.update(params.keys())
 
-        for v in signature.parameters.values():
-            if v.name in field_names:
-                if v.kind == inspect.Parameter.POSITIONAL_ONLY:
-                    args.append(getattr(converted_params, v.name))
+        for name, positional_only in param_info.parameters:
+            if name in field_names:
+                if positional_only:
+                    args.append(getattr(converted_params, name))
                 else:
-                    kw_args[v.name] = getattr(converted_params, v.name)
+                    kw_args[name] = getattr(converted_params, name)
 
-                rest.remove(v.name)
-            elif v.name == "params":
-                if v.kind == inspect.Parameter.POSITIONAL_ONLY:
+                rest.remove(name)
+            elif name == "params":
+                if positional_only:
                     args.append(converted_params)
-                    params_added = True
                 else:
-                    kw_args[v.name] = converted_params
-                    params_added = True
-            elif isinstance(params, dict) and v.name in params:
-                if v.kind == inspect.Parameter.POSITIONAL_ONLY:
-                    args.append(params[v.name])
+                    kw_args[name] = converted_params
+                params_added = True
+            elif isinstance(params, dict) and name in params:
+                if positional_only:
+                    args.append(params[name])
                 else:
-                    kw_args[v.name] = params[v.name]
-        if has_var_kw:
+                    kw_args[name] = params[name]
+        if param_info.has_var_kw:
             for r in rest:
                 if hasattr(converted_params, r):
                     kw_args[r] = getattr(converted_params, r)
@@ -742,11 +926,8 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
             else:
                 if e.threaded:
                     if e.is_coroutine:
-                        task = run_coroutine_in_thread(
-                            ensure_coroutine(cast(Callable[..., Any], e.method)),
-                            *params[0],
-                            **params[1],
-                        )
+                        # is_coroutine is cached on the entry, the method can be passed as is
+                        task = run_coroutine_in_thread(e.method, *params[0], **params[1])
                     else:
                         task = asyncio.wrap_future(run_as_task(e.method, *params[0], **params[1]))
                 else:
@@ -823,8 +1004,13 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
             entry.cancel()
 
     def cancel_all_received_request(self) -> None:
-        for entry in self._received_request.values():
-            entry.cancel()
+        with self._received_request_lock:
+            entries = list(self._received_request.values())
+
+        for entry in entries:
+            # finished requests only wait for their done callback to send the result
+            if not entry.future.done():
+                entry.cancel()
 
     @__logger.call
     async def handle_notification(self, message: JsonRPCNotification) -> None:
@@ -841,9 +1027,8 @@ class JsonRPCProtocol(JsonRPCProtocolBase):
             else:
                 if e.threaded:
                     if e.is_coroutine:
-                        task = run_coroutine_in_thread(
-                            ensure_coroutine(cast(Callable[..., Any], e.method)), *params[0], **params[1]
-                        )
+                        # is_coroutine is cached on the entry, the method can be passed as is
+                        task = run_coroutine_in_thread(e.method, *params[0], **params[1])
                     else:
                         task = asyncio.wrap_future(run_as_task(e.method, *params[0], **params[1]))
                 else:
@@ -896,15 +1081,21 @@ class ProtocolPartDescriptor(Generic[TProtocolPart]):
 
     def __get__(self, obj: Optional[Any], objtype: Type[Any]) -> TProtocolPart:
         if obj is not None:
-            if not isinstance(obj, HasPartInstance):
-                cast(HasPartInstance[TProtocolPart], obj).__rpc_part_instances__ = {}
+            # a plain attribute probe, isinstance on the runtime checkable protocol is much slower
+            part_instances: Optional[Dict[Type[TProtocolPart], TProtocolPart]] = getattr(
+                obj, "__rpc_part_instances__", None
+            )
+            if part_instances is None:
+                part_instances = cast(HasPartInstance[TProtocolPart], obj).__rpc_part_instances__ = {}
 
-            if self._instance_type not in cast(HasPartInstance[TProtocolPart], obj).__rpc_part_instances__:
-                instance = self._instance_type(*(obj, *self._instance_args), **self._instance_kwargs)
-                cast(HasPartInstance[TProtocolPart], obj).__rpc_part_instances__[self._instance_type] = instance
+            instance = part_instances.get(self._instance_type)
+            if instance is None:
+                instance = part_instances[self._instance_type] = self._instance_type(
+                    *(obj, *self._instance_args), **self._instance_kwargs
+                )
 
                 cast(JsonRPCProtocol, obj).registry.add_class_part_instance(instance)
 
-            return cast(HasPartInstance[TProtocolPart], obj).__rpc_part_instances__[self._instance_type]
+            return instance
 
         return self._instance_type  # type: ignore
@@ -53,7 +53,6 @@ from robotcode.core.lsp.types import WorkspaceFolder as TypesWorkspaceFolder
 from robotcode.core.uri import Uri
 from robotcode.core.utils.dataclasses import from_dict
 from robotcode.core.utils.logging import LoggingDescriptor
-from robotcode.core.utils.path import path_is_relative_to
 from robotcode.core.workspace import ConfigBase, TConfig, WorkspaceFolder
 from robotcode.core.workspace import Workspace as CoreWorkspace
 from robotcode.jsonrpc2.protocol import rpc_method
@@ -95,6 +94,10 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
 
         self._settings_cache: Dict[Tuple[Optional[WorkspaceFolder], str], ConfigBase] = {}
 
+        self._configuration_requests: List[Tuple[ConfigurationItem, Task[Optional[Any]]]] = []
+        self._configuration_requests_lock = threading.Lock()
+        self._configuration_flush_scheduled = False
+
     def server_initialize(self, sender: Any, initialization_options: Optional[Any] = None) -> None:
         if (
             initialization_options is not None
@@ -114,53 +117,25 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
             self.remove_file_watcher_entry(e)
 
     def extend_capabilities(self, capabilities: ServerCapabilities) -> None:
+        file_operation_options = FileOperationRegistrationOptions(
+            filters=[
+                FileOperationFilter(
+                    pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
+                )
+            ]
+        )
+
         capabilities.workspace = ServerCapabilitiesWorkspaceType(
             workspace_folders=WorkspaceFoldersServerCapabilities(
                 supported=True, change_notifications=str(uuid.uuid4())
             ),
             file_operations=FileOperationOptions(
-                did_create=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
-                will_create=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
-                did_rename=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
-                will_rename=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
-                did_delete=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
-                will_delete=FileOperationRegistrationOptions(
-                    filters=[
-                        FileOperationFilter(
-                            pattern=FileOperationPattern(glob=f"**/*.{{{','.join(self.parent.file_extensions)}}}")
-                        )
-                    ]
-                ),
+                did_create=file_operation_options,
+                will_create=file_operation_options,
+                did_rename=file_operation_options,
+                will_rename=file_operation_options,
+                did_delete=file_operation_options,
+                will_delete=file_operation_options,
             ),
         )
 
@@ -203,14 +178,13 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
     def _workspace_will_create_files(
         self, files: List[FileCreate], *args: Any, **kwargs: Any
     ) -> Optional[WorkspaceEdit]:
-        results = self.will_create_files(self, [f.uri for f in files])
-        if len(results) == 0:
+        edits = [e for e in self.will_create_files(self, [f.uri for f in files]) if isinstance(e, Mapping) and e]
+        if not edits:
             return None
 
         result: Dict[str, List[TextEdit]] = {}
-        for e in results:
-            if e is not None and isinstance(e, Mapping):
-                result.update(e)
+        for e in edits:
+            result.update(e)
 
         # TODO: support full WorkspaceEdit
 
@@ -303,17 +277,11 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
             and self.parent.client_capabilities.workspace.configuration
             and self.parent.running_thread != threading.current_thread()
         ):
-            return self.parent.send_request(
-                "workspace/configuration",
-                ConfigurationParams(
-                    items=[
-                        ConfigurationItem(
-                            scope_uri=str(scope_uri) if isinstance(scope_uri, Uri) else scope_uri,
-                            section=section,
-                        )
-                    ]
-                ),
-                List[Any],
+            return self._queue_configuration_request(
+                ConfigurationItem(
+                    scope_uri=str(scope_uri) if isinstance(scope_uri, Uri) else scope_uri,
+                    section=section,
+                )
             )
 
         result = self.settings
@@ -327,20 +295,65 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
         result_future.set_result([result])
         return result_future
 
-    def get_workspace_folder(self, uri: Union[Uri, str]) -> Optional[WorkspaceFolder]:
-        if isinstance(uri, str):
-            uri = Uri(uri)
+    def _queue_configuration_request(self, item: ConfigurationItem) -> Task[Optional[Any]]:
+        result_future: Task[Optional[Any]] = Task()
 
-        result = sorted(
-            [f for f in self.workspace_folders if path_is_relative_to(uri.to_path(), f.uri.to_path())],
-            key=lambda v1: len(v1.uri),
-            reverse=True,
-        )
+        with self._configuration_requests_lock:
+            self._configuration_requests.append((item, result_future))
 
-        if len(result) > 0:
-            return result[0]
+            if self._configuration_flush_scheduled:
+                return result_future
 
-        return None
+            self._configuration_flush_scheduled = True
+
+        # all requests queued until the event loop runs the flush are sent as one `workspace/configuration` request
+        loop = self.parent.loop
+        try:
+            if loop is not None and not loop.is_closed():
+                loop.call_soon_threadsafe(self._flush_configuration_requests)
+            else:
+                self._flush_configuration_requests()
+        except BaseException:
+            # without a scheduled flush the next request has to schedule one, otherwise all later requests
+            # would wait for a flush that never runs
+            with self._configuration_requests_lock:
+                self._configuration_flush_scheduled = False
+            raise
+
+        return result_future
+
+    def _flush_configuration_requests(self) -> None:
+        with self._configuration_requests_lock:
+            requests = self._configuration_requests
+            self._configuration_requests = []
+            self._configuration_flush_scheduled = False
+
+        if not requests:
+            return
+
+        def _configuration_done(f: Task[List[Any]]) -> None:
+            for i, (_, result_future) in enumerate(requests):
+                if result_future.done():
+                    continue
+
+                if f.cancelled():
+                    result_future.cancel()
+                elif f.exception() is not None:
+                    result_future.set_exception(cast(BaseException, f.exception()))
+                else:
+                    result = f.result()
+                    result_future.set_result([result[i] if result is not None and i < len(result) else None])
+
+        try:
+            self.parent.send_request(
+                "workspace/configuration",
+                ConfigurationParams(items=[item for item, _ in requests]),
+                List[Any],
+            ).add_done_callback(_configuration_done)
+        except Exception as e:
+            for _, result_future in requests:
+                if not result_future.done():
+                    result_future.set_exception(e)
 
     @rpc_method(name="workspace/didChangeWorkspaceFolders", param_type=DidChangeWorkspaceFoldersParams)
     def _workspace_did_change_workspace_folders(
@@ -364,6 +377,8 @@ class Workspace(LanguageServerProtocolPart, CoreWorkspace, FileWatcherManagerBas
             for a in event.added:
                 self._workspace_folders.append(WorkspaceFolder(a.name, Uri(a.uri)))
 
+            self.workspace_folders_changed()
+
         # TODO: do we need an event for this?
 
     @event
@@ -1,6 +1,12 @@
 import ast
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
 from concurrent.futures import CancelledError
-from typing import TYPE_CHECKING, Any, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional
 
 from robot.parsing.lexer.tokens import Token
 
@@ -15,13 +21,16 @@ from robotcode.core.lsp.types import (
 )
 from robotcode.core.text_document import TextDocument
 from robotcode.core.uri import Uri
+from robotcode.core.utils.dataclasses import as_json, from_json
 from robotcode.core.utils.logging import LoggingDescriptor
 from robotcode.language_server.robotframework.configuration import AnalysisConfig
+from robotcode.robot.diagnostics.document_cache_helper import VARIABLE_ERROR_TOKEN_TYPE
 from robotcode.robot.diagnostics.entities import (
     ArgumentDefinition,
     EnvironmentVariableDefinition,
     GlobalVariableDefinition,
     LibraryArgumentDefinition,
+    LibraryEntry,
 )
 from robotcode.robot.diagnostics.library_doc import LibraryDoc
 from robotcode.robot.diagnostics.namespace import Namespace
@@ -30,8 +39,9 @@ from robotcode.robot.utils.ast import (
     range_from_node,
     range_from_token,
 )
-from robotcode.robot.utils.stubs import HasError, HasErrors, HeaderAndBodyBlock
+from robotcode.robot.utils.stubs import HeaderAndBodyBlock
 
+from ...__version__ import __version__
 from ...common.parts.diagnostics import DiagnosticsCollectType, DiagnosticsResult
 
 if TYPE_CHECKING:
@@ -39,6 +49,13 @@ if TYPE_CHECKING:
 
 from .protocol_part import RobotLanguageServerProtocolPart
 
+DIAGNOSTICS_CACHE_MAX_ENTRIES = 4096
+
+_TOKEN_ERROR_TYPES: FrozenSet[str] = frozenset({Token.ERROR, Token.FATAL_ERROR})
+
+# check for cancellation only every 64 items, the reference lookups check it themselves per document
+_CANCEL_CHECK_MASK = 63
+
 
 class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
     _logger = LoggingDescriptor()
@@ -60,6 +77,15 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
 
         self.parent.diagnostics.on_get_related_documents.add(self._on_get_related_documents)
 
+        # least recently used cache files per cache folder, the oldest are removed when the folder is full
+        self._diagnostics_cache_index: Dict[Path, "OrderedDict[str, None]"] = {}
+        self._diagnostics_cache_lock = threading.Lock()
+
+        self._analysis_config_cache: weakref.WeakKeyDictionary[TextDocument, AnalysisConfig] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.parent.workspace.did_change_configuration.add(self._on_did_change_configuration)
+
     def _on_initialized(self, sender: Any) -> None:
         self.parent.diagnostics.analyze.add(self.analyze)
         self.parent.documents_cache.namespace_invalidated.add(self._on_namespace_invalidated)
@@ -67,21 +93,34 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
         self.parent.documents_cache.libraries_changed.add(self._on_libraries_changed)
         self.parent.documents_cache.variables_changed.add(self._on_variables_changed)
 
+    def _on_did_change_configuration(self, sender: Any, settings: Dict[str, Any]) -> None:
+        self._analysis_config_cache.clear()
+
+    def _get_analysis_config(self, document: TextDocument) -> AnalysisConfig:
+        result = self._analysis_config_cache.get(document)
+        if result is None:
+            result = self.parent.workspace.get_configuration(AnalysisConfig, document.uri)
+            self._analysis_config_cache[document] = result
+
+        return result
+
     def _on_libraries_changed(self, sender: Any, libraries: List[LibraryDoc]) -> None:
-        for doc in self.parent.documents.documents:
-            namespace = self.parent.documents_cache.get_only_initialized_namespace(doc)
-            if namespace is not None:
-                lib_docs = (e.library_doc for e in namespace.get_libraries().values())
-                if any(lib_doc in lib_docs for lib_doc in libraries):
-                    self.parent.diagnostics.force_refresh_document(doc)
+        for doc in self._docs_referencing(lambda n: n.get_libraries().values(), libraries):
+            self.parent.diagnostics.force_refresh_document(doc)
 
     def _on_variables_changed(self, sender: Any, variables: List[LibraryDoc]) -> None:
+        for doc in self._docs_referencing(lambda n: n.get_imported_variables().values(), variables):
+            self.parent.diagnostics.force_refresh_document(doc)
+
+    def _docs_referencing(
+        self, getter: Callable[[Namespace], Iterable[LibraryEntry]], changed: List[LibraryDoc]
+    ) -> Iterator[TextDocument]:
+        changed_docs = set(changed)
+
         for doc in self.parent.documents.documents:
             namespace = self.parent.documents_cache.get_only_initialized_namespace(doc)
-            if namespace is not None:
-                lib_docs = (e.library_doc for e in namespace.get_imported_variables().values())
-                if any(lib_doc in lib_docs for lib_doc in variables):
-                    self.parent.diagnostics.force_refresh_document(doc)
+            if namespace is not None and not changed_docs.isdisjoint(e.library_doc for e in getter(namespace)):
+                yield doc
 
     @language_id("robotframework")
     def analyze(self, sender: Any, document: TextDocument) -> None:
@@ -114,22 +153,108 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                     result.append(doc)
 
         lib_doc = namespace.get_library_doc()
-        for doc in self.parent.documents.documents:
-            if doc.language_id != "robotframework":
-                continue
 
-            doc_namespace = self.parent.documents_cache.get_only_initialized_namespace(doc)
-            if doc_namespace is None:
-                continue
+        robotframework_docs = [d for d in self.parent.documents.documents if d.language_id == "robotframework"]
+        for doc in robotframework_docs:
+            check_current_task_canceled()
 
-            if doc_namespace.is_analyzed():
-                for ref in doc_namespace.get_namespace_references():
-                    if ref.library_doc == lib_doc:
-                        result.append(doc)
+            if self._doc_references_libdoc(doc, lib_doc):
+                result.append(doc)
 
         return result
 
-    def modify_diagnostics(self, document: TextDocument, diagnostics: List[Diagnostic]) -> List[Diagnostic]:
+    def _doc_references_libdoc(self, document: TextDocument, lib_doc: LibraryDoc) -> bool:
+        namespace = self.parent.documents_cache.get_only_initialized_namespace(document)
+        if namespace is None or not namespace.is_analyzed():
+            return False
+
+        return any(ref.library_doc == lib_doc for ref in namespace.get_namespace_references())
+
+    def _get_diagnostics_cache_file(self, document: TextDocument, kind: str) -> Path:
+        languages = self.parent.documents_cache.get_languages_for_document(document)
+
+        key = hashlib.sha256()
+        key.update(f"{__version__}|{kind}|{self.parent.documents_cache.get_document_type(document).value}|".encode())
+        if languages is not None:
+            key.update("|".join(lang.name for lang in languages.languages).encode())
+        key.update(b"|")
+        key.update(document.text().encode("utf-8", "surrogatepass"))
+
+        return self.parent.documents_cache.get_imports_manager(document).diagnostics_cache_path / (
+            key.hexdigest() + ".json"
+        )
+
+    def _get_diagnostics_cache_index(self, cache_path: Path) -> "OrderedDict[str, None]":
+        index = self._diagnostics_cache_index.get(cache_path)
+        if index is None:
+            # the folder is only scanned once per session, after that the index is kept up to date in memory
+            entries = []
+            if cache_path.is_dir():
+                with os.scandir(cache_path) as it:
+                    entries = [(e.stat().st_mtime, e.name) for e in it if e.name.endswith(".json") and e.is_file()]
+
+            index = OrderedDict((name, None) for _, name in sorted(entries))
+            self._diagnostics_cache_index[cache_path] = index
+
+        return index
+
+    def _load_cached_diagnostics(self, document: TextDocument, kind: str) -> Optional[List[Diagnostic]]:
+        # only the content of saved documents is cached, intermediate versions while editing are not worth a lookup
+        if document.modified:
+            return None
+
+        try:
+            cache_file = self._get_diagnostics_cache_file(document, kind)
+            with self._diagnostics_cache_lock:
+                index = self._get_diagnostics_cache_index(cache_file.parent)
+                if cache_file.name not in index:
+                    return None
+                index.move_to_end(cache_file.name)
+
+            return from_json(cache_file.read_text("utf-8"), List[Diagnostic])
+        except FileNotFoundError:
+            return None
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as e:
+            self._logger.exception(e)
+
+        return None
+
+    def _save_cached_diagnostics(self, document: TextDocument, kind: str, diagnostics: List[Diagnostic]) -> None:
+        if document.modified:
+            return
+
+        try:
+            cache_file = self._get_diagnostics_cache_file(document, kind)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # the file is replaced atomically so that another thread or language server never loads a half written
+            # entry, the temp name doesn't end with .json so the index never picks it up
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_file.write_text(as_json(diagnostics, compact=True), "utf-8")
+            os.replace(tmp_file, cache_file)
+
+            with self._diagnostics_cache_lock:
+                index = self._get_diagnostics_cache_index(cache_file.parent)
+                index[cache_file.name] = None
+                index.move_to_end(cache_file.name)
+
+                while len(index) > DIAGNOSTICS_CACHE_MAX_ENTRIES:
+                    name, _ = index.popitem(last=False)
+                    Path(cache_file.parent, name).unlink(missing_ok=True)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as e:
+            self._logger.exception(e)
+
+    @staticmethod
+    def _whole_document_range(document: TextDocument) -> Range:
+        lines = document.get_lines()
+        last_line = lines[-1] if lines else ""
+
+        return Range(start=Position(line=0, character=0), end=Position(line=len(lines), character=len(last_line)))
+
+    def modify_diagnostics(self, document: TextDocument, diagnostics: Iterable[Diagnostic]) -> List[Diagnostic]:
         return self.parent.documents_cache.get_diagnostic_modifier(document).modify_diagnostics(diagnostics)
 
     @language_id("robotframework")
@@ -150,13 +275,7 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 self.collect_namespace_diagnostics,
                 [
                     Diagnostic(
-                        range=Range(
-                            start=Position(line=0, character=0),
-                            end=Position(
-                                line=len(document.get_lines()),
-                                character=len((document.get_lines())[-1] or ""),
-                            ),
-                        ),
+                        range=self._whole_document_range(document),
                         message=f"Fatal: can't get namespace diagnostics '{e}' ({type(e).__qualname__})",
                         severity=DiagnosticSeverity.ERROR,
                         source=self.source_name,
@@ -207,35 +326,12 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
         return document.get_cache(self._collect_token_errors)
 
     def _collect_token_errors(self, document: TextDocument) -> DiagnosticsResult:
-        from robot.errors import VariableError
-        from robot.parsing.lexer.tokens import Token
+        cached = self._load_cached_diagnostics(document, "tokens")
+        if cached is not None:
+            return DiagnosticsResult(self.collect_token_errors, self.modify_diagnostics(document, cached))
 
-        result: List[Diagnostic] = []
         try:
-            for token in self.parent.documents_cache.get_tokens(document):
-                check_current_task_canceled()
-
-                if token.type in [Token.ERROR, Token.FATAL_ERROR]:
-                    result.append(self._create_error_from_token(token))
-
-                try:
-                    for variable_token in token.tokenize_variables():
-                        if variable_token == token:
-                            break
-
-                        if variable_token.type in [Token.ERROR, Token.FATAL_ERROR]:
-                            result.append(self._create_error_from_token(variable_token))
-
-                except VariableError as e:
-                    result.append(
-                        Diagnostic(
-                            range=range_from_token(token),
-                            message=str(e),
-                            severity=DiagnosticSeverity.ERROR,
-                            source=self.source_name,
-                            code=type(e).__qualname__,
-                        )
-                    )
+            result = list(self._iter_token_errors(document))
         except (CancelledError, SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -243,13 +339,7 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 self.collect_token_errors,
                 [
                     Diagnostic(
-                        range=Range(
-                            start=Position(line=0, character=0),
-                            end=Position(
-                                line=len(document.get_lines()),
-                                character=len((document.get_lines())[-1] or ""),
-                            ),
-                        ),
+                        range=self._whole_document_range(document),
                         message=f"Fatal: can't get token diagnostics '{e}' ({type(e).__qualname__})",
                         severity=DiagnosticSeverity.ERROR,
                         source=self.source_name,
@@ -258,8 +348,27 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 ],
             )
 
+        self._save_cached_diagnostics(document, "tokens", result)
+
         return DiagnosticsResult(self.collect_token_errors, self.modify_diagnostics(document, result))
 
+    def _iter_token_errors(self, document: TextDocument) -> Iterator[Diagnostic]:
+        check_canceled = check_current_task_canceled
+
+        for token in self.parent.documents_cache.get_variable_tokens(document):
+            check_canceled()
+
+            if token.type in _TOKEN_ERROR_TYPES:
+                yield self._create_error_from_token(token)
+            elif token.type == VARIABLE_ERROR_TOKEN_TYPE:
+                yield Diagnostic(
+                    range=range_from_token(token),
+                    message=token.error,
+                    severity=DiagnosticSeverity.ERROR,
+                    source=self.source_name,
+                    code="VariableError",
+                )
+
     @language_id("robotframework")
     @_logger.call
     def collect_model_errors(
@@ -268,20 +377,14 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
         return document.get_cache(self._collect_model_errors)
 
     def _collect_model_errors(self, document: TextDocument) -> DiagnosticsResult:
-        try:
-            model = self.parent.documents_cache.get_model(document, True)
+        cached = self._load_cached_diagnostics(document, "model")
+        if cached is not None:
+            return DiagnosticsResult(self.collect_model_errors, self.modify_diagnostics(document, cached))
 
-            result: List[Diagnostic] = []
-            for node in iter_nodes(model):
-                check_current_task_canceled()
+        try:
+            result = list(self._iter_model_errors(document))
 
-                error = node.error if isinstance(node, HasError) else None
-                if error is not None:
-                    result.append(self._create_error_from_node(node, error))
-                errors = node.errors if isinstance(node, HasErrors) else None
-                if errors is not None:
-                    for e in errors:
-                        result.append(self._create_error_from_node(node, e))
+            self._save_cached_diagnostics(document, "model", result)
 
             return DiagnosticsResult(self.collect_model_errors, self.modify_diagnostics(document, result))
 
@@ -292,13 +395,7 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 self.collect_model_errors,
                 [
                     Diagnostic(
-                        range=Range(
-                            start=Position(line=0, character=0),
-                            end=Position(
-                                line=len(document.get_lines()),
-                                character=len((document.get_lines())[-1] or ""),
-                            ),
-                        ),
+                        range=self._whole_document_range(document),
                         message=f"Fatal: can't get model diagnostics '{e}' ({type(e).__qualname__})",
                         severity=DiagnosticSeverity.ERROR,
                         source=self.source_name,
@@ -307,14 +404,26 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 ],
             )
 
+    def _iter_model_errors(self, document: TextDocument) -> Iterator[Diagnostic]:
+        model = self.parent.documents_cache.get_model(document, True)
+
+        for node in iter_nodes(model):
+            check_current_task_canceled()
+
+            error: Optional[str] = getattr(node, "error", None)
+            if error is not None:
+                yield self._create_error_from_node(node, error)
+            errors: Optional[List[str]] = getattr(node, "errors", None)
+            if errors:
+                for e in errors:
+                    yield self._create_error_from_node(node, e)
+
     @language_id("robotframework")
     @_logger.call
     def collect_unused_keyword_references(
         self, sender: Any, document: TextDocument, diagnostics_type: DiagnosticsCollectType
     ) -> DiagnosticsResult:
-        config = self.parent.workspace.get_configuration(AnalysisConfig, document.uri)
-
-        if not config.find_unused_references:
+        if not self._get_analysis_config(document).find_unused_references:
             return DiagnosticsResult(self.collect_unused_keyword_references, [])
 
         if diagnostics_type != DiagnosticsCollectType.SLOW:
@@ -324,26 +433,10 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
 
     def _collect_unused_keyword_references(self, document: TextDocument) -> DiagnosticsResult:
         try:
-            namespace = self.parent.documents_cache.get_namespace(document)
-
-            result: List[Diagnostic] = []
-            for kw in (namespace.get_library_doc()).keywords.values():
-                check_current_task_canceled()
-
-                references = self.parent.robot_references.find_keyword_references(document, kw, False, True)
-                if not references:
-                    result.append(
-                        Diagnostic(
-                            range=kw.name_range,
-                            message=f"Keyword '{kw.name}' is not used.",
-                            severity=DiagnosticSeverity.WARNING,
-                            source=self.source_name,
-                            code="KeywordNotUsed",
-                            tags=[DiagnosticTag.UNNECESSARY],
-                        )
-                    )
-
-            return DiagnosticsResult(self.collect_unused_keyword_references, self.modify_diagnostics(document, result))
+            return DiagnosticsResult(
+                self.collect_unused_keyword_references,
+                self.modify_diagnostics(document, self._iter_unused_keyword_references(document)),
+            )
         except (CancelledError, SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -351,13 +444,7 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 self.collect_unused_keyword_references,
                 [
                     Diagnostic(
-                        range=Range(
-                            start=Position(line=0, character=0),
-                            end=Position(
-                                line=len(document.get_lines()),
-                                character=len((document.get_lines())[-1] or ""),
-                            ),
-                        ),
+                        range=self._whole_document_range(document),
                         message=f"Fatal: can't collect unused keyword references '{e}' ({type(e).__qualname__})",
                         severity=DiagnosticSeverity.ERROR,
                         source=self.source_name,
@@ -366,14 +453,30 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 ],
             )
 
+    def _iter_unused_keyword_references(self, document: TextDocument) -> Iterator[Diagnostic]:
+        namespace = self.parent.documents_cache.get_namespace(document)
+
+        for i, kw in enumerate((namespace.get_library_doc()).keywords.values()):
+            if i & _CANCEL_CHECK_MASK == 0:
+                check_current_task_canceled()
+
+            references = self.parent.robot_references.find_keyword_references(document, kw, False, True)
+            if not references:
+                yield Diagnostic(
+                    range=kw.name_range,
+                    message=f"Keyword '{kw.name}' is not used.",
+                    severity=DiagnosticSeverity.WARNING,
+                    source=self.source_name,
+                    code="KeywordNotUsed",
+                    tags=[DiagnosticTag.UNNECESSARY],
+                )
+
     @language_id("robotframework")
     @_logger.call
     def collect_unused_variable_references(
         self, sender: Any, document: TextDocument, diagnostics_type: DiagnosticsCollectType
     ) -> DiagnosticsResult:
-        config = self.parent.workspace.get_configuration(AnalysisConfig, document.uri)
-
-        if not config.find_unused_references:
+        if not self._get_analysis_config(document).find_unused_references:
             return DiagnosticsResult(self.collect_unused_variable_references, [])
 
         if diagnostics_type != DiagnosticsCollectType.SLOW:
@@ -383,36 +486,10 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
 
     def _collect_unused_variable_references(self, document: TextDocument) -> DiagnosticsResult:
         try:
-            namespace = self.parent.documents_cache.get_namespace(document)
-
-            result: List[Diagnostic] = []
-
-            for var in (namespace.get_variable_references()).keys():
-                check_current_task_canceled()
-
-                if isinstance(
-                    var, (LibraryArgumentDefinition, EnvironmentVariableDefinition, GlobalVariableDefinition)
-                ):
-                    continue
-
-                if var.name_token is not None and var.name_token.value and var.name_token.value.startswith("_"):
-                    continue
-
-                references = self.parent.robot_references.find_variable_references(document, var, False, True)
-                if not references:
-                    result.append(
-                        Diagnostic(
-                            range=var.name_range,
-                            message=f"{'Argument' if isinstance(var, ArgumentDefinition) else 'Variable'}"
-                            f" '{var.name}' is not used.",
-                            severity=DiagnosticSeverity.WARNING,
-                            source=self.source_name,
-                            code="VariableNotUsed",
-                            tags=[DiagnosticTag.UNNECESSARY],
-                        )
-                    )
-
-            return DiagnosticsResult(self.collect_unused_variable_references, self.modify_diagnostics(document, result))
+            return DiagnosticsResult(
+                self.collect_unused_variable_references,
+                self.modify_diagnostics(document, self._iter_unused_variable_references(document)),
+            )
         except (CancelledError, SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -420,13 +497,7 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                 self.collect_unused_variable_references,
                 [
                     Diagnostic(
-                        range=Range(
-                            start=Position(line=0, character=0),
-                            end=Position(
-                                line=len(document.get_lines()),
-                                character=len((document.get_lines())[-1] or ""),
-                            ),
-                        ),
+                        range=self._whole_document_range(document),
                         message=f"Fatal: can't collect unused variable references '{e}' ({type(e).__qualname__})",
                         severity=DiagnosticSeverity.ERROR,
                         source=self.source_name,
@@ -434,3 +505,28 @@ class RobotDiagnosticsProtocolPart(RobotLanguageServerProtocolPart):
                     )
                 ],
             )
+
+    def _iter_unused_variable_references(self, document: TextDocument) -> Iterator[Diagnostic]:
+        namespace = self.parent.documents_cache.get_namespace(document)
+
+        for i, var in enumerate((namespace.get_variable_references()).keys()):
+            if i & _CANCEL_CHECK_MASK == 0:
+                check_current_task_canceled()
+
+            if isinstance(var, (LibraryArgumentDefinition, EnvironmentVariableDefinition, GlobalVariableDefinition)):
+                continue
+
+            if var.name_token is not None and var.name_token.value and var.name_token.value.startswith("_"):
+                continue
+
+            references = self.parent.robot_references.find_variable_references(document, var, False, True)
+            if not references:
+                yield Diagnostic(
+                    range=var.name_range,
+                    message=f"{'Argument' if isinstance(var, ArgumentDefinition) else 'Variable'}"
+                    f" '{var.name}' is not used.",
+                    severity=DiagnosticSeverity.WARNING,
+                    source=self.source_name,
+                    code="VariableNotUsed",
+                    tags=[DiagnosticTag.UNNECESSARY],
+                )
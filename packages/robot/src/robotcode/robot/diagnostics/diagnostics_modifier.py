@@ -4,7 +4,7 @@ from ast import AST
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 from robot.parsing.lexer.tokens import Token
 from robot.parsing.model.blocks import Block, File
@@ -260,5 +260,5 @@ class DiagnosticsModifier:
 
         return diagnostic
 
-    def modify_diagnostics(self, diagnostics: List[Diagnostic]) -> List[Diagnostic]:
+    def modify_diagnostics(self, diagnostics: Iterable[Diagnostic]) -> List[Diagnostic]:
         return [d for d in map(self.modify_diagnostic, diagnostics) if d is not None]
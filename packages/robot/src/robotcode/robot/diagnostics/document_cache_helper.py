@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import ast
 import io
+import re
 import threading
 import weakref
 from logging import CRITICAL
@@ -42,6 +43,10 @@ from .workspace_config import (
     WorkspaceAnalysisConfig,
 )
 
+VARIABLE_ERROR_TOKEN_TYPE = "VARIABLE_ERROR"
+
+_VARIABLE_SIGIL_RE = re.compile(r"[$@&%]")
+
 
 class UnknownFileTypeError(Exception):
     pass
@@ -177,6 +182,36 @@ class DocumentsCacheHelper:
             return document.get_cache(self.__get_tokens_data_only)
         return document.get_cache(self.__get_tokens)
 
+    def get_variable_tokens(self, document: TextDocument) -> List[Token]:
+        """Returns the tokens of the document, each followed by the variable tokens it contains.
+
+        Tokens whose variables can't be parsed are followed by a token of type
+        `VARIABLE_ERROR_TOKEN_TYPE` carrying the error message.
+        """
+        return document.get_cache(self.__get_variable_tokens)
+
+    def __get_variable_tokens(self, document: TextDocument) -> List[Token]:
+        from robot.errors import VariableError
+
+        result: List[Token] = []
+
+        for token in self.get_tokens(document):
+            result.append(token)
+
+            if not token.value or _VARIABLE_SIGIL_RE.search(token.value) is None:
+                continue
+
+            try:
+                for variable_token in token.tokenize_variables():
+                    if variable_token == token:
+                        break
+
+                    result.append(variable_token)
+            except VariableError as e:
+                result.append(Token(VARIABLE_ERROR_TOKEN_TYPE, token.value, token.lineno, token.col_offset, str(e)))
+
+        return result
+
     def __get_tokens_data_only(self, document: TextDocument) -> List[Token]:
         document_type = self.get_document_type(document)
         if document_type == DocumentType.INIT:
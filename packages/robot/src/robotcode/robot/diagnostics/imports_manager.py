@@ -2,6 +2,7 @@ import ast
 import itertools
 import multiprocessing as mp
 import os
+import pickle
 import shutil
 import sys
 import threading
@@ -9,7 +10,8 @@ import weakref
 import zlib
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from pathlib import Path
 from typing import (
@@ -22,6 +24,8 @@ from typing import (
     Optional,
     Set,
     Tuple,
+    TypeVar,
+    cast,
     final,
 )
 
@@ -47,6 +51,7 @@ from .entities import (
     VariableDefinition,
 )
 from .library_doc import (
+    DEFAULT_LIBRARIES,
     ROBOT_LIBRARY_PACKAGE,
     CompleteResult,
     LibraryDoc,
@@ -85,24 +90,96 @@ REST_EXTENSIONS = (".rst", ".rest")
 LOAD_LIBRARY_TIME_OUT = 30
 FIND_FILE_TIME_OUT = 10
 COMPLETE_LIBRARY_IMPORT_TIME_OUT = COMPLETE_RESOURCE_IMPORT_TIME_OUT = COMPLETE_VARIABLES_IMPORT_TIME_OUT = 10
+MAX_EXECUTOR_WORKERS = 4
+MAX_LIBRARY_ENTRIES = 256
+
+# modules imported once by the forkserver, so that the workers forked from it don't import robot again,
+# BuiltIn is imported by every namespace, so its import is paid once by the server and not by every worker
+FORKSERVER_PRELOAD_MODULES = ["robotcode.robot.diagnostics.library_doc", "robot.libraries.BuiltIn"]
+
+
+def _get_mp_context() -> "mp.context.BaseContext":
+    if "forkserver" in mp.get_all_start_methods():
+        context = mp.get_context("forkserver")
+        context.set_forkserver_preload(FORKSERVER_PRELOAD_MODULES)
+        return context
+
+    return mp.get_context("spawn")
+
+
+_T = TypeVar("_T")
+
+
+_logger = LoggingDescriptor(name=__name__)
+
+
+def _terminate_executor_processes(executor: ProcessPoolExecutor) -> None:
+    # a worker hanging in a library import never ends by itself and a shutdown of the executor would wait for it
+    # forever, terminating the workers breaks the pool, fails its pending futures and lets the shutdown return.
+    # ProcessPoolExecutor has no public api for its workers, `_processes` is a dict of pid to process that is set
+    # to None on shutdown, checked against CPython 3.8 to 3.13
+    if not hasattr(executor, "_processes"):
+        _logger.warning(
+            "Can't terminate the worker processes of a timed out executor, "
+            "ProcessPoolExecutor has no attribute '_processes' in this Python version. "
+            "Shutting down the executor may block until the worker finishes."
+        )
+        return
+
+    for process in list((executor._processes or {}).values()):
+        if process.is_alive():
+            process.terminate()
+
+
+def _call_with_environment(
+    environment: Dict[str, str], python_path: List[str], func: Callable[..., _T], *args: Any
+) -> _T:
+    # the forkserver is started once and its workers inherit the environment and sys.path of that moment,
+    # the settings like `robot.env` or `robot.pythonpath` change them later in the language server process
+    os.environ.clear()
+    os.environ.update(environment)
+    sys.path[:] = python_path
+
+    return func(*args)
+
+
+def _submit_to_worker(executor: ProcessPoolExecutor, func: Callable[..., _T], *args: Any) -> "Future[_T]":
+    return executor.submit(_call_with_environment, dict(os.environ), list(sys.path), func, *args)
+
+
+def _get_worker_result(executor: ProcessPoolExecutor, future: "Future[_T]") -> _T:
+    try:
+        return future.result(LOAD_LIBRARY_TIME_OUT)
+    except FutureTimeoutError:
+        future.cancel()
+        _terminate_executor_processes(executor)
+        raise
+
+
+# the docs of the default libraries only depend on the installed robot version, so they are loaded once per
+# process and shared between all imports managers instead of going through the spec cache or a worker every time
+_DEFAULT_LIBRARY_DOCS: Dict[str, LibraryDoc] = {}
 
 
 class _EntryKey:
-    pass
+    __slots__ = ()
 
 
-@dataclass()
+# the keys are immutable, frozen dataclasses generate __eq__ over the fields,
+# and without an instance __dict__ every key is a small fixed size object
+@dataclass(frozen=True)
 class _LibrariesEntryKey(_EntryKey):
+    __slots__ = ("_hash", "args", "name")
+
     name: str
     args: Tuple[Any, ...]
 
-    def __eq__(self, __value: object) -> bool:
-        if isinstance(__value, _LibrariesEntryKey):
-            return __value.name == self.name and __value.args == self.args
-        return super().__eq__(__value)
+    # hashing the args tuple touches every argument, so it is done once and not on every dict lookup
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name, self.args)))
 
     def __hash__(self) -> int:
-        return hash((self.name, self.args))
+        return self._hash  # type: ignore[attr-defined, no-any-return]
 
 
 class _ImportEntry(ABC):
@@ -274,12 +351,11 @@ class _LibrariesEntry(_ImportEntry):
             return self._lib_doc
 
 
-@dataclass()
+@dataclass(frozen=True)
 class _ResourcesEntryKey(_EntryKey):
-    name: str
+    __slots__ = ("name",)
 
-    def __hash__(self) -> int:
-        return hash(self.name)
+    name: str
 
 
 class _ResourcesEntry(_ImportEntry):
@@ -372,13 +448,18 @@ class _ResourcesEntry(_ImportEntry):
             return self._lib_doc
 
 
-@dataclass()
+@dataclass(frozen=True)
 class _VariablesEntryKey(_EntryKey):
+    __slots__ = ("_hash", "args", "name")
+
     name: str
     args: Tuple[Any, ...]
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name, self.args)))
+
     def __hash__(self) -> int:
-        return hash((self.name, self.args))
+        return self._hash  # type: ignore[attr-defined, no-any-return]
 
 
 class _VariablesEntry(_ImportEntry):
@@ -534,6 +615,12 @@ class ImportsManager:
             / get_robot_version_str()
             / "variables"
         )
+        self.diagnostics_cache_path = (
+            self.cache_path
+            / f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+            / get_robot_version_str()
+            / "diagnostics"
+        )
 
         self.cmd_variables = variables
         self.cmd_variable_files = variable_files
@@ -564,6 +651,11 @@ class ImportsManager:
         if environment:
             self._environment.update(environment)
 
+        self._model_docs_lock = RLock(default_timeout=120, name="ImportsManager._model_docs_lock")
+        self._model_docs: weakref.WeakKeyDictionary[ast.AST, Dict[Tuple[str, str, str, bool], LibraryDoc]] = (
+            weakref.WeakKeyDictionary()
+        )
+
         self._library_files_cache = SimpleLRUCache(1024)
         self._resource_files_cache = SimpleLRUCache(1024)
         self._variables_files_cache = SimpleLRUCache(1024)
@@ -755,36 +847,44 @@ class ImportsManager:
 
         lib_doc: Optional[LibraryDoc]
 
+        # the entries are checked outside of the manager locks, an entry that is just loading its libdoc holds
+        # its own lock and must not block the lookup of other imports
         with self._libaries_lock:
-            for l_key, l_entry in self._libaries.items():
-                lib_doc = None
-                if l_entry.is_valid():
-                    lib_doc = l_entry.get_libdoc()
-                result = l_entry.check_file_changed(changes)
-                if result is not None:
-                    libraries_changed.append((l_key, result, lib_doc))
+            libraries = list(self._libaries.items())
+
+        for l_key, l_entry in libraries:
+            lib_doc = None
+            if l_entry.is_valid():
+                lib_doc = l_entry.get_libdoc()
+            result = l_entry.check_file_changed(changes)
+            if result is not None:
+                libraries_changed.append((l_key, result, lib_doc))
 
         try:
             with self._resources_lock:
-                for r_key, r_entry in self._resources.items():
-                    lib_doc = None
-                    if r_entry.is_valid():
-                        lib_doc = r_entry.get_libdoc()
-                    result = r_entry.check_file_changed(changes)
-                    if result is not None:
-                        resource_changed.append((r_key, result, lib_doc))
+                resources = list(self._resources.items())
+
+            for r_key, r_entry in resources:
+                lib_doc = None
+                if r_entry.is_valid():
+                    lib_doc = r_entry.get_libdoc()
+                result = r_entry.check_file_changed(changes)
+                if result is not None:
+                    resource_changed.append((r_key, result, lib_doc))
         except BaseException as e:
             self._logger.exception(e)
             raise
 
         with self._variables_lock:
-            for v_key, v_entry in self._variables.items():
-                lib_doc = None
-                if v_entry.is_valid():
-                    lib_doc = v_entry.get_libdoc()
-                result = v_entry.check_file_changed(changes)
-                if result is not None:
-                    variables_changed.append((v_key, result, lib_doc))
+            variables = list(self._variables.items())
+
+        for v_key, v_entry in variables:
+            lib_doc = None
+            if v_entry.is_valid():
+                lib_doc = v_entry.get_libdoc()
+            result = v_entry.check_file_changed(changes)
+            if result is not None:
+                variables_changed.append((v_key, result, lib_doc))
 
         if libraries_changed:
             for l, t, _ in libraries_changed:
@@ -826,6 +926,27 @@ class ImportsManager:
         finally:
             self._library_files_cache.clear()
 
+    def __pop_unreferenced_library_entries(self) -> List[_LibrariesEntry]:
+        # must be called with _libaries_lock held, entries still referenced by a namespace are removed by their
+        # finalizers, of the others only the least recently used are dropped once there are too many entries,
+        # e.g. the ones loaded for hover or completion without a sentinel. The default libraries are imported
+        # by every namespace without a sentinel, so their references don't tell if they are used and they are kept
+        result: List[_LibrariesEntry] = []
+
+        to_remove = len(self._libaries) - MAX_LIBRARY_ENTRIES
+        if to_remove <= 0:
+            return result
+
+        for entry_key, entry in list(self._libaries.items())[:-1]:
+            if len(result) >= to_remove:
+                break
+
+            if len(entry.references) == 0 and entry.name not in DEFAULT_LIBRARIES:
+                self._libaries.pop(entry_key, None)
+                result.append(entry)
+
+        return result
+
     def __remove_resource_entry(
         self,
         entry_key: _ResourcesEntryKey,
@@ -1119,10 +1240,25 @@ class ImportsManager:
     def executor(self) -> ProcessPoolExecutor:
         with self._executor_lock:
             if self._executor is None:
-                self._executor = ProcessPoolExecutor(mp_context=mp.get_context("spawn"))
+                # every worker is a full interpreter, don't start one per cpu just for import completions
+                self._executor = ProcessPoolExecutor(
+                    max_workers=min(os.cpu_count() or 1, MAX_EXECUTOR_WORKERS), mp_context=_get_mp_context()
+                )
 
         return self._executor
 
+    def _run_in_executor(self, func: Callable[..., _T], *args: Any) -> _T:
+        executor = self.executor
+        try:
+            return _get_worker_result(executor, _submit_to_worker(executor, func, *args))
+        except FutureTimeoutError:
+            # the pool is broken now, the next call starts a new one
+            with self._executor_lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+
     def _get_library_libdoc_handler(
         self,
         variables: Optional[Dict[str, Any]] = None,
@@ -1145,6 +1281,12 @@ class ImportsManager:
         base_dir: str,
         variables: Optional[Dict[str, Any]] = None,
     ) -> LibraryDoc:
+        is_default_library = not args and name in DEFAULT_LIBRARIES
+        if is_default_library:
+            default_library_doc = _DEFAULT_LIBRARY_DOCS.get(name)
+            if default_library_doc is not None:
+                return default_library_doc
+
         meta, _source, ignore_arguments = self.get_library_meta(name, base_dir, variables)
 
         if meta is not None and not meta.has_errors:
@@ -1163,9 +1305,17 @@ class ImportsManager:
                         if not saved_meta.has_errors and saved_meta == meta:
                             spec_path = Path(
                                 self.lib_doc_cache_path,
-                                meta.filepath_base + ".spec.json",
+                                meta.filepath_base + ".spec.pkl",
                             )
-                            return from_json(spec_path.read_text("utf-8"), LibraryDoc)
+                            # specs written by older versions as json are just rebuilt
+                            if spec_path.exists():
+                                with spec_path.open("rb") as f:
+                                    spec = cast(LibraryDoc, pickle.load(f))
+
+                                if is_default_library:
+                                    _DEFAULT_LIBRARY_DOCS[name] = spec
+
+                                return spec
 
                     except (SystemExit, KeyboardInterrupt):
                         raise
@@ -1178,17 +1328,21 @@ class ImportsManager:
                 except BaseException as e:
                     self._logger.exception(e)
 
-        executor = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
         try:
-            result = executor.submit(
-                get_library_doc,
-                name,
-                args if not ignore_arguments else (),
-                working_dir,
-                base_dir,
-                self.get_resolvable_command_line_variables(),
-                variables,
-            ).result(LOAD_LIBRARY_TIME_OUT)
+            result = _get_worker_result(
+                executor,
+                _submit_to_worker(
+                    executor,
+                    get_library_doc,
+                    name,
+                    args if not ignore_arguments else (),
+                    working_dir,
+                    base_dir,
+                    self.get_resolvable_command_line_variables(),
+                    variables,
+                ),
+            )
 
         except (SystemExit, KeyboardInterrupt):
             raise
@@ -1201,17 +1355,26 @@ class ImportsManager:
         if result.stdout:
             self._logger.warning(lambda: f"stdout captured at loading library {name}{args!r}:\n{result.stdout}")
 
+        if is_default_library and not result.errors:
+            _DEFAULT_LIBRARY_DOCS[name] = result
+
         try:
             if meta is not None:
                 meta.has_errors = bool(result.errors)
 
                 meta_file = Path(self.lib_doc_cache_path, meta.filepath_base + ".meta.json")
-                spec_file = Path(self.lib_doc_cache_path, meta.filepath_base + ".spec.json")
+                spec_file = Path(self.lib_doc_cache_path, meta.filepath_base + ".spec.pkl")
 
                 spec_file.parent.mkdir(parents=True, exist_ok=True)
 
                 try:
-                    spec_file.write_text(as_json(result), "utf-8")
+                    # the LibraryDoc already comes pickled from the worker process, loading it back this way is
+                    # much faster than rebuilding it from json, the file is replaced atomically so that concurrent
+                    # language servers never read a half written spec
+                    tmp_file = spec_file.with_name(f"{spec_file.name}.{os.getpid()}.tmp")
+                    with tmp_file.open("wb") as f:
+                        pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp_file, spec_file)
                 except (SystemExit, KeyboardInterrupt):
                     raise
                 except BaseException as e:
@@ -1248,6 +1411,8 @@ class ImportsManager:
             )
             entry_key = _LibrariesEntryKey(source, resolved_args)
 
+            evicted: List[_LibrariesEntry] = []
+
             with self._libaries_lock:
                 if entry_key not in self._libaries:
                     self._libaries[entry_key] = _LibrariesEntry(
@@ -1259,12 +1424,25 @@ class ImportsManager:
                         self._get_library_libdoc_handler(variables),
                         ignore_reference=sentinel is None,
                     )
-
-            entry = self._libaries[entry_key]
-
-            if not entry.ignore_reference and sentinel is not None and sentinel not in entry.references:
-                weakref.finalize(sentinel, self.__remove_library_entry, entry_key, entry)
-                entry.references.add(sentinel)
+                    evicted = self.__pop_unreferenced_library_entries()
+                else:
+                    self._libaries.move_to_end(entry_key)
+
+                entry = self._libaries[entry_key]
+
+                # an entry first loaded without a sentinel, e.g. for hover or completion, is tracked
+                # from the first namespace that uses it, otherwise it would look unused and could be evicted
+                if sentinel is not None and sentinel not in entry.references:
+                    entry.ignore_reference = False
+                    weakref.finalize(sentinel, self.__remove_library_entry, entry_key, entry)
+                    entry.references.add(sentinel)
+
+            # invalidate outside of the lock, an evicted entry may still be loading in another thread
+            for e in evicted:
+                e.invalidate()
+            if evicted:
+                self._library_files_cache.clear()
+                self._logger.debug(lambda: f"Evicted {len(evicted)} unreferenced library entries")
 
             return entry.get_libdoc()
 
@@ -1277,7 +1455,16 @@ class ImportsManager:
         scope: str = "GLOBAL",
         append_model_errors: bool = True,
     ) -> LibraryDoc:
-        return get_model_doc(
+        # the document models are cached until the document changes, so a namespace that is rebuilt for the
+        # same model, e.g. after an imported library changed, can reuse the already built doc
+        key = (source, model_type, scope, append_model_errors)
+
+        with self._model_docs_lock:
+            docs = self._model_docs.get(model)
+            if docs is not None and key in docs:
+                return docs[key]
+
+        result = get_model_doc(
             model=model,
             source=source,
             model_type=model_type,
@@ -1285,6 +1472,11 @@ class ImportsManager:
             append_model_errors=append_model_errors,
         )
 
+        with self._model_docs_lock:
+            self._model_docs.setdefault(model, {})[key] = result
+
+        return result
+
     def _get_variables_libdoc_handler(
         self,
         variables: Optional[Dict[str, Any]] = None,
@@ -1348,17 +1540,21 @@ class ImportsManager:
                 except BaseException as e:
                     self._logger.exception(e)
 
-        executor = ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
         try:
-            result = executor.submit(
-                get_variables_doc,
-                name,
-                args,
-                working_dir,
-                base_dir,
-                self.get_resolvable_command_line_variables() if resolve_command_line_vars else None,
-                variables,
-            ).result(LOAD_LIBRARY_TIME_OUT)
+            result = _get_worker_result(
+                executor,
+                _submit_to_worker(
+                    executor,
+                    get_variables_doc,
+                    name,
+                    args,
+                    working_dir,
+                    base_dir,
+                    self.get_resolvable_command_line_variables() if resolve_command_line_vars else None,
+                    variables,
+                ),
+            )
         except (SystemExit, KeyboardInterrupt):
             raise
         except BaseException as e:
@@ -1521,14 +1717,14 @@ class ImportsManager:
         base_dir: str = ".",
         variables: Optional[Dict[str, Any]] = None,
     ) -> List[CompleteResult]:
-        return self.executor.submit(
+        return self._run_in_executor(
             complete_library_import,
             name,
             str(self.root_folder),
             base_dir,
             self.get_resolvable_command_line_variables(),
             variables,
-        ).result(LOAD_LIBRARY_TIME_OUT)
+        )
 
     def complete_resource_import(
         self,
@@ -1536,14 +1732,14 @@ class ImportsManager:
         base_dir: str = ".",
         variables: Optional[Dict[str, Any]] = None,
     ) -> Optional[List[CompleteResult]]:
-        return self.executor.submit(
+        return self._run_in_executor(
             complete_resource_import,
             name,
             str(self.root_folder),
             base_dir,
             self.get_resolvable_command_line_variables(),
             variables,
-        ).result(LOAD_LIBRARY_TIME_OUT)
+        )
 
     def complete_variables_import(
         self,
@@ -1551,14 +1747,14 @@ class ImportsManager:
         base_dir: str = ".",
         variables: Optional[Dict[str, Any]] = None,
     ) -> Optional[List[CompleteResult]]:
-        return self.executor.submit(
+        return self._run_in_executor(
             complete_variables_import,
             name,
             str(self.root_folder),
             base_dir,
             self.get_resolvable_command_line_variables(),
             variables,
-        ).result(LOAD_LIBRARY_TIME_OUT)
+        )
 
     def resolve_variable(
         self,
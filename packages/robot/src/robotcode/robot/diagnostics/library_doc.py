@@ -418,6 +418,13 @@ def robot_arg_repr(arg: Any) -> Optional[str]:
     return str(robot_arg.default_repr)
 
 
+MAX_ARGUMENT_INFOS = 4096
+
+# keywords of a library share many identical arguments (`name`, `*args`, `**kwargs`, ...), equal arguments are
+# created only once and shared between the keywords, this also keeps them shared in the pickled library specs
+_ARGUMENT_INFOS: Dict[Tuple[Any, ...], "ArgumentInfo"] = {}
+
+
 @dataclass
 class ArgumentInfo:
     name: str
@@ -431,22 +438,41 @@ class ArgumentInfo:
     def from_robot(arg: Any) -> ArgumentInfo:
         robot_arg = cast(ArgInfo, arg)
 
-        return ArgumentInfo(
-            name=robot_arg.name,
-            default_value=robot_arg_repr(robot_arg),
-            str_repr=str(arg),
-            types=(
-                robot_arg.types_reprs
-                if get_robot_version() < (7, 0)
-                else (
-                    ([str(robot_arg.type)] if not robot_arg.type.is_union else [str(t) for t in robot_arg.type.nested])
-                    if robot_arg.type
-                    else None
-                )
-            ),
-            kind=KeywordArgumentKind[robot_arg.kind],
-            required=robot_arg.required,
+        name = robot_arg.name
+        default_value = robot_arg_repr(robot_arg)
+        str_repr = str(arg)
+        types = (
+            robot_arg.types_reprs
+            if get_robot_version() < (7, 0)
+            else (
+                ([str(robot_arg.type)] if not robot_arg.type.is_union else [str(t) for t in robot_arg.type.nested])
+                if robot_arg.type
+                else None
+            )
         )
+        kind = KeywordArgumentKind[robot_arg.kind]
+        required = robot_arg.required
+
+        key = (name, default_value, str_repr, tuple(types) if types is not None else None, kind, required)
+
+        result = _ARGUMENT_INFOS.get(key)
+        if result is None:
+            if len(_ARGUMENT_INFOS) >= MAX_ARGUMENT_INFOS:
+                _ARGUMENT_INFOS.clear()
+
+            result = _ARGUMENT_INFOS.setdefault(
+                key,
+                ArgumentInfo(
+                    name=name,
+                    default_value=default_value,
+                    str_repr=str_repr,
+                    types=list(types) if types is not None else None,
+                    kind=kind,
+                    required=required,
+                ),
+            )
+
+        return result
 
     def __str__(self) -> str:
         return self.signature()
@@ -1274,17 +1300,24 @@ class VariablesDoc(LibraryDoc):
         return result
 
 
+_PATH_SEPARATORS = ("/", os.sep)
+_VARIABLES_FILE_EXTENSIONS = (
+    (".py", ".yml", ".yaml", ".json") if get_robot_version() >= (6, 1) else (".py", ".yml", ".yaml")
+)
+
+
+# only the last characters are lowercased, these are called for every import name
 def is_library_by_path(path: str) -> bool:
-    return path.lower().endswith((".py", "/", os.sep))
+    return path[-3:].lower() == ".py" or path.endswith(_PATH_SEPARATORS)
 
 
 def is_variables_by_path(path: str) -> bool:
-    if get_robot_version() >= (6, 1):
-        return path.lower().endswith((".py", ".yml", ".yaml", ".json", "/", os.sep))
-    return path.lower().endswith((".py", ".yml", ".yaml", "/", os.sep))
+    return path[-5:].lower().endswith(_VARIABLES_FILE_EXTENSIONS) or path.endswith(_PATH_SEPARATORS)
 
 
 def _update_env(working_dir: str = ".") -> None:
+    # changing the working directory affects the whole process, so this is only done in the entry points that
+    # run in a worker process and import user code, the other helpers get the base dir passed explicitly
     os.chdir(Path(working_dir))
 
 
@@ -1577,8 +1610,6 @@ def resolve_variable(
     variables: Optional[Dict[str, Optional[Any]]] = None,
 ) -> Any:
 
-    _update_env(working_dir)
-
     if contains_variable(name, "$@&%"):
         robot_variables = resolve_robot_variables(working_dir, base_dir, command_line_variables, variables)
         if get_robot_version() >= (6, 1):
@@ -1598,8 +1629,6 @@ def replace_variables_scalar(
     ignore_errors: bool = False,
 ) -> Any:
 
-    _update_env(working_dir)
-
     if contains_variable(scalar, "$@&%"):
         robot_variables = resolve_robot_variables(working_dir, base_dir, command_line_variables, variables)
         if get_robot_version() >= (6, 1):
@@ -1644,8 +1673,6 @@ def _find_library_internal(
     variables: Optional[Dict[str, Optional[Any]]] = None,
 ) -> Tuple[str, Any]:
 
-    _update_env(working_dir)
-
     robot_variables = None
 
     robot_variables = resolve_robot_variables(working_dir, base_dir, command_line_variables, variables)
@@ -1751,6 +1778,8 @@ def get_library_doc(
 
         return lib
 
+    _update_env(working_dir)
+
     with _std_capture() as std_capturer:
         import_name, robot_variables = _find_library_internal(
             name,
@@ -1895,8 +1924,11 @@ def get_library_doc(
                     elif isinstance(lib, robot.running.testlibraries.HybridLibrary):
                         libdoc.library_type = LibraryType.HYBRID
 
+                # the builder holds no state, one instance serves the init and all keywords of the library
+                keyword_doc_builder = KeywordDocBuilder()
+
                 init_wrappers = [KeywordWrapper(lib.init, source)]
-                init_keywords = [(KeywordDocBuilder().build_keyword(k), k) for k in init_wrappers]
+                init_keywords = [(keyword_doc_builder.build_keyword(k), k) for k in init_wrappers]
                 libdoc.inits = KeywordStore(
                     keywords=[
                         KeywordDoc(
@@ -1954,7 +1986,7 @@ def get_library_doc(
 
                     return result
 
-                keyword_docs = [(KeywordDocBuilder().build_keyword(k), k) for k in keyword_wrappers]
+                keyword_docs = [(keyword_doc_builder.build_keyword(k), k) for k in keyword_wrappers]
                 libdoc.keywords = KeywordStore(
                     source=libdoc.name,
                     source_type=libdoc.type,
@@ -2043,9 +2075,13 @@ def get_library_doc(
                             libtype=libdoc.type,
                             doc_format=libdoc.doc_format,
                         )
-                        for td in _get_type_docs(
-                            [kw[0] for kw in keyword_docs + init_keywords],
-                            lib.converters,
+                        # sorted, the order of the set depends on the hash seed of the worker process
+                        for td in sorted(
+                            _get_type_docs(
+                                [kw[0] for kw in keyword_docs + init_keywords],
+                                lib.converters,
+                            ),
+                            key=lambda td: td.name,
                         )
                     ]
 
@@ -2076,8 +2112,6 @@ def _find_variables_internal(
     variables: Optional[Dict[str, Optional[Any]]] = None,
 ) -> str:
 
-    _update_env(working_dir)
-
     robot_variables = resolve_robot_variables(working_dir, base_dir, command_line_variables, variables)
 
     if contains_variable(name, "$@&%"):
@@ -2141,6 +2175,7 @@ def get_variables_doc(
     command_line_variables: Optional[Dict[str, Optional[Any]]] = None,
     variables: Optional[Dict[str, Optional[Any]]] = None,
 ) -> VariablesDoc:
+    _update_env(working_dir)
 
     import_name: str = name
     stem = Path(name).stem
@@ -2379,8 +2414,6 @@ def find_file(
     variables: Optional[Dict[str, Optional[Any]]] = None,
     file_type: str = "Resource",
 ) -> str:
-    _update_env(working_dir)
-
     robot_variables = resolve_robot_variables(working_dir, base_dir, command_line_variables, variables)
     if contains_variable(name, "$@&%"):
         try:
@@ -2650,13 +2683,14 @@ def get_model_doc(
     append_model_errors: bool = True,
 ) -> LibraryDoc:
     errors: List[Error] = []
-    keyword_name_nodes: List[KeywordName] = []
-    keywords_nodes: List[Keyword] = []
+    # keyword and keyword name nodes by line, the first node on a line wins like a linear search would
+    keyword_name_nodes: Dict[int, KeywordName] = {}
+    keywords_nodes: Dict[int, Keyword] = {}
     for node in ast.walk(model):
         if isinstance(node, Keyword):
-            keywords_nodes.append(node)
+            keywords_nodes.setdefault(node.lineno, node)
         if isinstance(node, KeywordName):
-            keyword_name_nodes.append(node)
+            keyword_name_nodes.setdefault(node.lineno, node)
 
         error = node.error if isinstance(node, HasError) else None
         if error is not None:
@@ -2682,16 +2716,16 @@ def get_model_doc(
                     )
 
     def get_keyword_name_token_from_line(line: int) -> Optional[Token]:
-        for keyword_name in keyword_name_nodes:
-            if keyword_name.lineno == line:
-                return cast(Token, keyword_name.get_token(RobotToken.KEYWORD_NAME))
+        keyword_name = keyword_name_nodes.get(line)
+        if keyword_name is not None:
+            return cast(Token, keyword_name.get_token(RobotToken.KEYWORD_NAME))
 
         return None
 
     def get_argument_definitions_from_line(
         line: int,
     ) -> List[ArgumentDefinition]:
-        keyword_node = next((k for k in keywords_nodes if k.lineno == line), None)
+        keyword_node = keywords_nodes.get(line)
         if keyword_node is None:
             return []
 
@@ -2799,6 +2833,8 @@ def get_model_doc(
             )
         return r
 
+    keyword_doc_builder = KeywordDocBuilder(resource=True)
+
     libdoc.keywords = KeywordStore(
         source=libdoc.name,
         source_type=libdoc.type,
@@ -2829,7 +2865,7 @@ def get_model_doc(
                 argument_definitions=get_argument_definitions_from_line(kw[0].lineno),
             )
             for kw in [
-                (KeywordDocBuilder(resource=True).build_keyword(lw), lw)
+                (keyword_doc_builder.build_keyword(lw), lw)
                 for lw in (lib.handlers if get_robot_version() < (7, 0) else lib.keywords)
             ]
         ],
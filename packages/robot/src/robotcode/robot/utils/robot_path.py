@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 from os import PathLike
 from pathlib import Path
@@ -50,21 +51,17 @@ def _find_relative_path(
     path: Union[Path, PathLike[str], str],
     basedir: Union[Path, PathLike[str], str],
 ) -> Optional[str]:
+    # this scans the whole sys.path for every import, so just use plain os.path calls to check the candidates
     for base in [basedir, *sys.path]:
         if not base:
             continue
-        base_path = Path(base)
 
-        if not base_path.is_dir():
-            continue
-
-        ret = Path(base, path).absolute()
+        candidate = os.path.join(base, path)
 
-        if _is_valid_file(ret):
-            return str(ret)
+        if _is_valid_file(candidate):
+            return str(Path(candidate).absolute())
     return None
 
 
 def _is_valid_file(path: Union[Path, PathLike[str], str]) -> bool:
-    path = Path(path)
-    return path.is_file() or (path.is_dir() and Path(path, "__init__.py").is_fifo())
+    return os.path.isfile(path) or (os.path.isdir(path) and Path(path, "__init__.py").is_fifo())
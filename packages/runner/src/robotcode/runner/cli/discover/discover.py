@@ -1,8 +1,14 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
 import os
 import platform
 import re
+import stat
 import sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from io import IOBase
 from pathlib import Path
@@ -10,12 +16,14 @@ from typing import (
     Any,
     Dict,
     Iterable,
+    Iterator,
     List,
-    MutableMapping,
     Optional,
+    Set,
     Tuple,
     Union,
 )
+from urllib import parse
 
 import click
 import robot.running.model as running_model
@@ -26,7 +34,7 @@ from robot.model.visitor import SuiteVisitor
 from robot.output import LOGGER, Message
 from robot.running.builder import TestSuiteBuilder
 from robot.running.builder.builders import SuiteStructureParser
-from robot.utils import NormalizedDict, normalize
+from robot.utils import normalize
 from robot.utils.filereader import FileReader
 
 from robotcode.core.ignore_spec import GIT_IGNORE_FILE, ROBOT_IGNORE_FILE, iter_files
@@ -39,7 +47,7 @@ from robotcode.core.lsp.types import (
 )
 from robotcode.core.uri import Uri
 from robotcode.core.utils.cli import show_hidden_arguments
-from robotcode.core.utils.dataclasses import from_json
+from robotcode.core.utils.dataclasses import as_json, from_json
 from robotcode.core.utils.path import normalized_path
 from robotcode.plugin import (
     Application,
@@ -56,6 +64,7 @@ from ..robot import ROBOT_OPTIONS, ROBOT_VERSION_OPTIONS, RobotFrameworkEx, hand
 class ErroneousTestSuite(running_model.TestSuite):
     def __init__(self, *args: Any, error_message: str, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+        self.error_message = error_message
 
 
 __patched = False
@@ -63,6 +72,11 @@ __patched = False
 
 _stdin_data: Optional[Dict[Uri, str]] = None
 _app: Optional[Application] = None
+_use_cache = False
+_resolve_symlinks = False
+_parse_jobs = 1
+_shard_builder: Optional[TestSuiteBuilder] = None
+_shard_logger: Optional["DiagnosticsLogger"] = None
 
 
 def _patch() -> None:
@@ -71,8 +85,12 @@ def _patch() -> None:
         return
     __patched = True
 
-    if get_robot_version() < (6, 1):
-        if get_robot_version() > (5, 0) and get_robot_version() < (6, 0) or get_robot_version() < (5, 0):
+    robot_version = get_robot_version()
+
+    if robot_version < (6, 1):
+        from robot.running.builder.parsers import format_name
+
+        if (5, 0) < robot_version < (6, 0) or robot_version < (5, 0):
             from robot.running.builder.testsettings import (  # pyright: ignore[reportMissingImports]
                 TestDefaults,
             )
@@ -100,18 +118,9 @@ def _patch() -> None:
             except DataError as e:
                 LOGGER.error(str(e))
                 parent_defaults = self._stack[-1][-1] if self._stack else None
-                if get_robot_version() < (6, 1):
-                    from robot.running.builder.parsers import format_name
-
-                    return ErroneousTestSuite(
-                        error_message=str(e),
-                        name=format_name(structure.source),
-                        source=structure.source,
-                    ), TestDefaults(parent_defaults)
-
                 return ErroneousTestSuite(
                     error_message=str(e),
-                    name=TestSuite.name_from_source(structure.source),
+                    name=format_name(structure.source),
                     source=structure.source,
                 ), TestDefaults(parent_defaults)
 
@@ -127,12 +136,14 @@ def _patch() -> None:
 
         SuiteStructureParser._validate_execution_mode = _validate_execution_mode
 
-    elif get_robot_version() >= (6, 1):
+    else:
         from robot.parsing.suitestructure import SuiteDirectory, SuiteFile
         from robot.running.builder.settings import (  # pyright: ignore[reportMissingImports]
             TestDefaults,
         )
 
+        name_from_source = TestSuite.name_from_source
+
         old_validate_not_empty = TestSuiteBuilder._validate_not_empty
 
         def _validate_not_empty(self: Any, suite: TestSuite, multi_source: bool = False) -> None:
@@ -152,7 +163,7 @@ def _patch() -> None:
                 LOGGER.error(str(e))
                 return ErroneousTestSuite(
                     error_message=str(e),
-                    name=TestSuite.name_from_source(structure.source),
+                    name=name_from_source(structure.source),
                     source=structure.source,
                 )
 
@@ -169,13 +180,13 @@ def _patch() -> None:
                 LOGGER.error(str(e))
                 return ErroneousTestSuite(
                     error_message=str(e),
-                    name=TestSuite.name_from_source(structure.source),
+                    name=name_from_source(structure.source),
                     source=structure.source,
                 ), TestDefaults(self.parent_defaults)
 
         SuiteStructureParser._build_suite_directory = build_suite_directory
 
-        if get_robot_version() < (6, 1, 1):
+        if robot_version < (6, 1, 1):
             old_validate_execution_mode = SuiteStructureParser._validate_execution_mode
 
             def _validate_execution_mode(self: SuiteStructureParser, suite: TestSuite) -> None:
@@ -201,7 +212,10 @@ def _patch() -> None:
     FileReader._get_file = get_file
 
 
-@dataclass
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TestItem:
     type: str
     id: str
@@ -218,81 +232,236 @@ class TestItem:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ResultItem:
     items: List[TestItem]
     diagnostics: Optional[Dict[str, List[Diagnostic]]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Statistics:
     suites: int = 0
     suites_with_tests: int = 0
     tests: int = 0
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class DiscoverCache:
+    key: str
+    manifest: Dict[str, List[int]]
+    rpa: bool
+    root: TestItem
+    test_tags: List[List[str]]
+    statistics: Statistics
+    diagnostics: Optional[Dict[str, List[Diagnostic]]] = None
+
+
+_ZERO_POSITION = Position(line=0, character=0)
+_ZERO_RANGE = Range(start=_ZERO_POSITION, end=_ZERO_POSITION)
+
+_Source = Union[str, Path]
+
+_PREFETCH_MIN_SOURCES = 64
+_PREFETCH_MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+
+def _stat_is_file(path: "Union[str, os.PathLike[str]]") -> Optional[bool]:
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return None
+
+
 def get_rel_source(source: Optional[str]) -> Optional[str]:
     if source is None:
         return None
     try:
-        return str(Path(source).relative_to(Path.cwd()).as_posix())
+        return Path(source).relative_to(Path.cwd()).as_posix()
     except ValueError:
         return str(source)
 
 
 class Collector(SuiteVisitor):
-    def __init__(self) -> None:
+    def __init__(self, build_tree: bool = True) -> None:
         super().__init__()
-        absolute_path = Path.cwd()
+        # without the tree only the top level suite is added to `all`, the flat lists are filled as usual
+        self._build_tree = build_tree
+        self._cwd = Path.cwd()
+        self._resolve_symlinks = _resolve_symlinks
+        self._abs_cache: Dict[_Source, Path] = {}
+        self._abs_str_cache: Dict[_Source, str] = {}
+        self._uri_cache: Dict[_Source, str] = {}
+        self._rel_cache: Dict[_Source, str] = {}
+        self._norm_tag_cache: Dict[str, str] = {}
+        self._is_file_cache: Dict[_Source, Optional[bool]] = {}
+        self._line_ranges: Dict[int, Range] = {0: _ZERO_RANGE}
+        self.test_tags: List[List[str]] = []
+        self._source_strs: Dict[Optional[_Source], str] = {}
+        absolute_path = self._cwd
+        cwd_uri = str(Uri.from_path(absolute_path))
+        self._cwd_prefix = os.path.join(str(absolute_path), "")
+        self._cwd_uri_prefix = cwd_uri if cwd_uri.endswith("/") else cwd_uri + "/"
         self.all: TestItem = TestItem(
             type="workspace",
             id=str(absolute_path),
             name=absolute_path.name,
             longname=absolute_path.name,
-            uri=str(Uri.from_path(absolute_path)),
+            uri=cwd_uri,
             needs_parse_include=get_robot_version() >= (6, 1),
         )
         self._current = self.all
         self.suites: List[TestItem] = []
         self.tests: List[TestItem] = []
-        self.tags: Dict[str, List[TestItem]] = defaultdict(list)
+        self._tags: Optional[Dict[str, List[TestItem]]] = None
         self.normalized_tags: Dict[str, List[TestItem]] = defaultdict(list)
         self.statistics = Statistics()
-        self._collected: List[MutableMapping[str, Any]] = [NormalizedDict(ignore="_")]
+        self._collected: List[Set[str]] = [set()]
+
+    @property
+    def tags(self) -> Dict[str, List[TestItem]]:
+        # the not normalized tags are rarely needed, so they are only indexed on first use
+        if self._tags is None:
+            self._tags = defaultdict(list)
+            for item, raw_tags in zip(self.tests, self.test_tags):
+                for tag in raw_tags:
+                    self._tags[tag].append(item)
+        return self._tags
+
+    def _source_str(self, source: Optional[_Source]) -> str:
+        result = self._source_strs.get(source)
+        if result is None:
+            result = self._source_strs[source] = str(source)
+        return result
+
+    def _absolute_path(self, source: _Source) -> Path:
+        result = self._abs_cache.get(source)
+        if result is None:
+            result = self._abs_cache[source] = (
+                Path(source).resolve() if self._resolve_symlinks else normalized_path(source)
+            )
+        return result
+
+    def _absolute_path_str(self, source: _Source) -> str:
+        result = self._abs_str_cache.get(source)
+        if result is None:
+            result = self._abs_str_cache[source] = str(self._absolute_path(source))
+        return result
+
+    def _uri(self, source: _Source) -> str:
+        result = self._uri_cache.get(source)
+        if result is None:
+            result = self._uri_cache[source] = self._uri_from_path(self._absolute_path(source))
+        return result
+
+    def _uri_from_path(self, path: Path) -> str:
+        path_str = str(path)
+        if path_str.startswith(self._cwd_prefix):
+            return self._cwd_uri_prefix + parse.quote(path_str[len(self._cwd_prefix) :].replace(os.sep, "/"))
+        return str(Uri.from_path(path))
+
+    def _rel_source(self, source: Optional[_Source]) -> Optional[str]:
+        if source is None:
+            return None
+
+        result = self._rel_cache.get(source)
+        if result is None:
+            try:
+                result = Path(source).relative_to(self._cwd).as_posix()
+            except ValueError:
+                result = self._source_str(source)
+            self._rel_cache[source] = result
+        return result
+
+    def _cached_is_file(self, source: _Source) -> Optional[bool]:
+        try:
+            return self._is_file_cache[source]
+        except KeyError:
+            pass
+
+        result = self._is_file_cache[source] = _stat_is_file(source)
+        return result
+
+    @classmethod
+    def from_cache(cls, cache: "DiscoverCache") -> "Collector":
+        result = cls()
+        result.all = cache.root
+        result.statistics = cache.statistics
+
+        test_tags = iter(cache.test_tags)
+        stack = list(reversed(cache.root.children or []))
+        while stack:
+            item = stack.pop()
+            if item.type == "test":
+                raw_tags = next(test_tags, [])
+                for tag in raw_tags:
+                    result.normalized_tags[result._norm(tag)].append(item)
+                result.test_tags.append(raw_tags)
+                result.tests.append(item)
+            else:
+                result.suites.append(item)
+                stack.extend(reversed(item.children or []))
+
+        return result
+
+    def prefetch(self, suite: TestSuite) -> None:
+        sources: Set[_Source] = set()
+        stack = [suite]
+        while stack:
+            s = stack.pop()
+            if s.source:
+                sources.add(s.source)
+            stack.extend(s.suites)
+
+        pending = [s for s in sources if s not in self._is_file_cache]
+        if len(pending) < _PREFETCH_MIN_SOURCES:
+            return
+
+        with ThreadPoolExecutor(max_workers=_PREFETCH_MAX_WORKERS, thread_name_prefix="discover_stat") as executor:
+            self._is_file_cache.update(zip(pending, executor.map(_stat_is_file, pending)))
+
+    def _is_file(self, source: _Source) -> bool:
+        return self._cached_is_file(source) is True
+
+    def _line_range(self, line: int) -> Range:
+        result = self._line_ranges.get(line)
+        if result is None:
+            position = Position(line=line, character=0)
+            result = self._line_ranges[line] = Range(start=position, end=position)
+        return result
+
+    def _norm(self, tag: str) -> str:
+        result = self._norm_tag_cache.get(tag)
+        if result is None:
+            result = self._norm_tag_cache[tag] = normalize(tag, ignore="_")
+        return result
 
     def visit_suite(self, suite: TestSuite) -> None:
-        if suite.name in self._collected[-1] and suite.parent.source:
+        key = self._norm(suite.name)
+        if key in self._collected[-1] and suite.parent.source:
+            parent_is_file = self._cached_is_file(suite.parent.source) if suite.source else None
             LOGGER.warn(
                 (
-                    f"Warning in {'file' if Path(suite.parent.source).is_file() else 'folder'} "
-                    f"'{suite.parent.source}': "
-                    if suite.source and Path(suite.parent.source).exists()
+                    f"Warning in {'file' if parent_is_file else 'folder'} '{suite.parent.source}': "
+                    if parent_is_file is not None
                     else ""
                 )
                 + f"Multiple suites with name '{suite.name}' in suite '{suite.parent.longname}'."
             )
 
-        self._collected[-1][suite.name] = True
-        self._collected.append(NormalizedDict(ignore="_"))
+        self._collected[-1].add(key)
+        self._collected.append(set())
         try:
-            absolute_path = normalized_path(Path(suite.source)) if suite.source else None
+            absolute_path = self._absolute_path_str(suite.source) if suite.source else ""
             item = TestItem(
                 type="suite",
-                id=f"{absolute_path or ''};{suite.longname}",
+                id=f"{absolute_path};{suite.longname}",
                 name=suite.name,
                 longname=suite.longname,
-                uri=str(Uri.from_path(absolute_path)) if absolute_path else None,
-                source=str(suite.source),
-                rel_source=get_rel_source(suite.source),
-                range=(
-                    Range(
-                        start=Position(line=0, character=0),
-                        end=Position(line=0, character=0),
-                    )
-                    if suite.source and Path(suite.source).is_file()
-                    else None
-                ),
-                children=[],
+                uri=self._uri(suite.source) if suite.source else None,
+                source=self._source_str(suite.source),
+                rel_source=self._rel_source(suite.source),
+                range=_ZERO_RANGE if suite.source and self._is_file(suite.source) else None,
+                children=[] if self._build_tree else None,
                 error=suite.error_message if isinstance(suite, ErroneousTestSuite) else None,
             )
         except ValueError as e:
@@ -300,9 +469,10 @@ class Collector(SuiteVisitor):
 
         self.suites.append(item)
 
-        if self._current.children is None:
-            self._current.children = []
-        self._current.children.append(item)
+        if self._build_tree or self._current is self.all:
+            if self._current.children is None:
+                self._current.children = []
+            self._current.children.append(item)
 
         old_current = self._current
         self._current = item
@@ -319,41 +489,47 @@ class Collector(SuiteVisitor):
         self._collected.pop()
 
     def visit_test(self, test: TestCase) -> None:
-        if test.name in self._collected[-1]:
+        key = self._norm(test.name)
+        if key in self._collected[-1]:
             LOGGER.warn(
                 f"Warning in file '{test.source}' on line {test.lineno}: "
                 f"Multiple {'task' if test.parent.rpa else 'test'}s with name '{test.name}' in suite "
                 f"'{test.parent.longname}'."
             )
-        self._collected[-1][test.name] = True
+        self._collected[-1].add(key)
 
-        if self._current.children is None:
-            self._current.children = []
         try:
-            absolute_path = normalized_path(Path(test.source)) if test.source is not None else None
+            absolute_path = self._absolute_path_str(test.source) if test.source is not None else ""
             item = TestItem(
                 type="test",
-                id=f"{absolute_path or ''};{test.longname};{test.lineno}",
+                id=f"{absolute_path};{test.longname};{test.lineno}",
                 name=test.name,
                 longname=test.longname,
-                uri=str(Uri.from_path(absolute_path)) if absolute_path else None,
-                source=str(test.source),
-                rel_source=get_rel_source(test.source),
-                range=Range(
-                    start=Position(line=test.lineno - 1, character=0),
-                    end=Position(line=test.lineno - 1, character=0),
-                ),
-                tags=list(set(normalize(str(t), ignore="_") for t in test.tags)) if test.tags else None,
+                uri=self._uri(test.source) if test.source is not None else None,
+                source=self._source_str(test.source),
+                rel_source=self._rel_source(test.source),
+                range=self._line_range(test.lineno - 1),
             )
         except ValueError as e:
             raise ValueError(f"Error while parsing suite {test.source}: {e}") from e
 
-        for tag in test.tags:
-            self.tags[str(tag)].append(item)
-            self.normalized_tags[normalize(str(tag), ignore="_")].append(item)
+        raw_tags: List[str] = []
+        if test.tags:
+            norm_tags: Dict[str, None] = {}
+            for t in test.tags:
+                tag = str(t)
+                norm_tag = self._norm(tag)
+                raw_tags.append(tag)
+                self.normalized_tags[norm_tag].append(item)
+                norm_tags[norm_tag] = None
+            item.tags = sorted(norm_tags)
+        self.test_tags.append(raw_tags)
 
         self.tests.append(item)
-        self._current.children.append(item)
+        if self._build_tree:
+            if self._current.children is None:
+                self._current.children = []
+            self._current.children.append(item)
 
         self.statistics.tests += 1
 
@@ -372,9 +548,39 @@ class Collector(SuiteVisitor):
     help="Read file contents from stdin. This is an internal option.",
     hidden=show_hidden_arguments(),
 )
+@click.option(
+    "--cache / --no-cache",
+    "use_cache",
+    default=False,
+    show_default=True,
+    help="Reuse the results of a previous discover run if the configuration and the discovered files are unchanged.",
+)
+@click.option(
+    "--resolve-symlinks / --no-resolve-symlinks",
+    "resolve_symlinks",
+    default=False,
+    show_default=True,
+    help="Resolve symbolic links in the paths, ids and uris of the discovered items. "
+    "If disabled, the paths are only made absolute and normalized.",
+)
+@click.option(
+    "--parse-jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of processes used to parse the given paths in parallel, `0` means one per CPU. "
+    "Only used if more than one path is given and the platform supports forking processes.",
+)
 @add_options(*ROBOT_VERSION_OPTIONS)
 @pass_application
-def discover(app: Application, show_diagnostics: bool, read_from_stdin: bool) -> None:
+def discover(
+    app: Application,
+    show_diagnostics: bool,
+    read_from_stdin: bool,
+    use_cache: bool,
+    resolve_symlinks: bool,
+    parse_jobs: int,
+) -> None:
     """\
     Commands to discover informations about the current project.
 
@@ -385,21 +591,27 @@ def discover(app: Application, show_diagnostics: bool, read_from_stdin: bool) ->
     robotcode --profile regression discover tests
     ```
     """
-    global _app
+    global _app, _use_cache, _resolve_symlinks, _parse_jobs
     _app = app
+    _use_cache = use_cache
+    _resolve_symlinks = resolve_symlinks
+    _parse_jobs = parse_jobs
     app.show_diagnostics = show_diagnostics or app.config.log_enabled
     if read_from_stdin:
         global _stdin_data
-        _stdin_data = {
-            Uri(k).normalized(): v for k, v in from_json(sys.stdin.buffer.read(), Dict[str, str], strict=True).items()
-        }
-        app.verbose(f"Read data from stdin: {_stdin_data!r}")
+        data = json.loads(sys.stdin.buffer.read())
+        # `all` is shadowed by the command of the same name in this module
+        if not isinstance(data, dict) or any(not isinstance(k, str) or not isinstance(v, str) for k, v in data.items()):
+            raise UnknownError("Data read from stdin must be a JSON object mapping document URIs to their contents.")
+
+        _stdin_data = {Uri(k).normalized(): v for k, v in data.items()}
+        app.verbose(lambda: f"Read data from stdin: {_stdin_data!r}")
 
 
-RE_IN_FILE_LINE_MATCHER = re.compile(
-    r".+\sin\s(file|folder)\s'(?P<file>.*)'(\son\sline\s(?P<line>\d+))?:(?P<message>.*)"
+RE_DIAGNOSTIC_MESSAGE_MATCHER = re.compile(
+    r"(?:.+\sin\s(?:file|folder)\s'(?P<file>.*)'(?:\son\sline\s(?P<line>\d+))?:(?P<message>.*))"
+    r"|(?:Parsing\s'(?P<parsing_file>.*)'\sfailed:(?P<parsing_message>.*))"
 )
-RE_PARSING_FAILED_MATCHER = re.compile(r"Parsing\s'(?P<file>.*)'\sfailed:(?P<message>.*)")
 
 
 class DiagnosticsLogger:
@@ -411,8 +623,13 @@ class DiagnosticsLogger:
             self.messages.append(msg)
 
 
+_DIAGNOSTIC_SEVERITIES = {"ERROR": DiagnosticSeverity.ERROR}
+
+
 def build_diagnostics(messages: List[Message]) -> Dict[str, List[Diagnostic]]:
-    result: Dict[str, List[Diagnostic]] = {}
+    result: Dict[str, List[Diagnostic]] = defaultdict(list)
+    cwd_uri = str(Uri.from_path(Path.cwd()))
+    uri_cache: Dict[str, str] = {}
 
     def add_diagnostic(
         message: Message,
@@ -420,49 +637,252 @@ def build_diagnostics(messages: List[Message]) -> Dict[str, List[Diagnostic]]:
         line: Optional[int] = None,
         text: Optional[str] = None,
     ) -> None:
-        source_uri = str(Uri.from_path(normalized_path(Path(source_uri)) if source_uri else Path.cwd()))
-
-        if source_uri not in result:
-            result[source_uri] = []
+        if not source_uri:
+            uri = cwd_uri
+        else:
+            cached_uri = uri_cache.get(source_uri)
+            if cached_uri is None:
+                cached_uri = uri_cache[source_uri] = str(Uri.from_path(normalized_path(Path(source_uri))))
+            uri = cached_uri
 
-        result[source_uri].append(
+        position = Position(line=(line or 1) - 1, character=0)
+        result[uri].append(
             Diagnostic(
-                range=Range(
-                    start=Position(line=(line or 1) - 1, character=0),
-                    end=Position(line=(line or 1) - 1, character=0),
-                ),
+                range=Range(start=position, end=position),
                 message=text or message.message,
-                severity=DiagnosticSeverity.ERROR if message.level == "ERROR" else DiagnosticSeverity.WARNING,
+                severity=_DIAGNOSTIC_SEVERITIES.get(message.level, DiagnosticSeverity.WARNING),
                 source="robotcode.discover",
                 code="discover",
             )
         )
 
     for message in messages:
-        if match := RE_IN_FILE_LINE_MATCHER.match(message.message):
+        # both kinds of located messages quote the file name
+        match = RE_DIAGNOSTIC_MESSAGE_MATCHER.match(message.message) if "'" in message.message else None
+        if match is None:
+            add_diagnostic(message)
+        elif match.group("file") is not None:
             add_diagnostic(
                 message,
                 match.group("file"),
                 int(match.group("line")) if match.group("line") is not None else None,
                 text=match.group("message").strip(),
             )
-        elif match := RE_PARSING_FAILED_MATCHER.match(message.message):
+        else:
             add_diagnostic(
                 message,
-                match.group("file"),
-                text=match.group("message").strip(),
+                match.group("parsing_file"),
+                text=match.group("parsing_message").strip(),
             )
-        else:
-            add_diagnostic(message)
 
     return result
 
 
+_DISCOVER_CACHE_OPTIONS = (
+    "doc",
+    "exclude",
+    "extension",
+    "include",
+    "language",
+    "metadata",
+    "name",
+    "parseinclude",
+    "pythonpath",
+    "rpa",
+    "runemptysuite",
+    "settag",
+    "suite",
+    "task",
+    "test",
+)
+
+
+def _discover_cache_key_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_discover_cache_key_value(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return [type(value).__qualname__, vars(value) if hasattr(value, "__dict__") else str(value)]
+
+
+def _discover_cache_file(root_folder: Optional[Path], options: Dict[str, Any], arguments: List[str]) -> Optional[Path]:
+    from ...__version__ import __version__
+
+    if options.get("randomize", "none").lower() != "none":
+        return None
+
+    # pre-run modifiers and custom parsers are python modules that can change the result and import other modules,
+    # the manifest only knows the suite files, so a cached result could be stale without notice
+    if options.get("prerunmodifier") or options.get("parser"):
+        return None
+
+    key = hashlib.sha256(
+        json.dumps(
+            [
+                __version__,
+                get_robot_version(),
+                sys.version,
+                str(Path.cwd()),
+                _resolve_symlinks,
+                arguments,
+                {k: _discover_cache_key_value(options[k]) for k in _DISCOVER_CACHE_OPTIONS if k in options},
+            ],
+            default=str,
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    return (root_folder or Path.cwd()) / ".robotcode_cache" / "discover" / f"{key}.json"
+
+
+def _build_discover_manifest(paths: Iterable[str], sources: Iterable[str] = ()) -> Dict[str, List[int]]:
+    # directory mtimes catch added and removed suites, file mtimes and sizes catch changed ones
+    result: Dict[str, List[int]] = {}
+
+    stack = [os.path.abspath(p) for p in paths]
+    stack.extend(os.path.abspath(s) for s in sources)
+    while stack:
+        path = stack.pop()
+        if path in result:
+            continue
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+
+        if not stat.S_ISDIR(st.st_mode):
+            result[path] = [st.st_mtime_ns, st.st_size]
+            continue
+
+        result[path] = [st.st_mtime_ns, 0]
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("__init__."):
+                        stack.append(entry.path)
+                    elif not entry.name.startswith((".", "_")) and entry.is_dir():
+                        stack.append(entry.path)
+        except OSError:
+            pass
+
+    return result
+
+
+def _load_discover_cache(cache_file: Path, arguments: List[str]) -> Optional[DiscoverCache]:
+    try:
+        cache = from_json(cache_file.read_bytes(), DiscoverCache)
+    except (SystemExit, KeyboardInterrupt):
+        raise
+    except BaseException:
+        return None
+
+    if cache.key != cache_file.stem:
+        return None
+
+    if _build_discover_manifest(arguments, cache.manifest.keys()) != cache.manifest:
+        return None
+
+    return cache
+
+
+def _save_discover_cache(cache_file: Path, cache: DiscoverCache) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(as_json(cache, compact=True), "utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def _can_build_in_processes(arguments: List[str]) -> bool:
+    # workers are forked so they inherit the patches, the stdin data and the builder without pickling them
+    return (
+        _parse_jobs != 1
+        and len(arguments) > 1
+        and get_robot_version() > (6, 1)
+        and "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+def _init_suite_shard_worker() -> None:
+    global _shard_logger
+
+    LOGGER.unregister_console_logger()
+    _shard_logger = DiagnosticsLogger()
+    LOGGER.register_logger(_shard_logger)
+
+
+def _build_suite_shard(source: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]], bool]:
+    assert _shard_builder is not None
+    assert _shard_logger is not None
+
+    # registering a logger replays the messages cached so far, they are already known to the parent process
+    _shard_logger.messages.clear()
+
+    suite = _shard_builder.build(source)
+
+    has_errors = False
+    stack = [suite]
+    while stack and not has_errors:
+        s = stack.pop()
+        has_errors = isinstance(s, ErroneousTestSuite)
+        stack.extend(s.suites)
+
+    return suite.to_dict(), [(m.message, m.level) for m in _shard_logger.messages], has_errors
+
+
+def _build_suite_in_processes(builder: TestSuiteBuilder, arguments: List[str]) -> TestSuite:
+    global _shard_builder
+
+    _shard_builder = builder
+    try:
+        with ProcessPoolExecutor(
+            min(_parse_jobs or os.cpu_count() or 1, len(arguments)),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_suite_shard_worker,
+        ) as executor:
+            shards = list(executor.map(_build_suite_shard, arguments))
+    finally:
+        _shard_builder = None
+
+    suite = running_model.TestSuite()
+    for source, (data, messages, has_errors) in zip(arguments, shards):
+        if has_errors:
+            # erroneous suites don't survive the dict round trip, so build this source here again
+            suite.suites.append(builder.build(source))
+            continue
+
+        for message, level in messages:
+            LOGGER.write(message, level)
+        suite.suites.append(running_model.TestSuite.from_dict(data))
+
+    if builder.rpa is not None:
+        suite.rpa = builder.rpa
+    elif not any(s.rpa is not False for s in suite.suites):
+        suite.rpa = False
+    elif not any(s.rpa is not True for s in suite.suites):
+        suite.rpa = True
+
+    return suite
+
+
+_OUTPUT_CHUNK_SIZE = 1024
+
+
+def _chunked(parts: Iterable[str], size: int = _OUTPUT_CHUNK_SIZE) -> Iterator[str]:
+    it = iter(parts)
+    while chunk := list(itertools.islice(it, size)):
+        yield "".join(chunk)
+
+
 def handle_options(
     app: Application,
     by_longname: Tuple[str, ...],
     exclude_by_longname: Tuple[str, ...],
     robot_options_and_args: Tuple[str, ...],
+    build_tree: bool = True,
 ) -> Tuple[TestSuite, Collector, Optional[Dict[str, List[Diagnostic]]]]:
     root_folder, profile, cmd_options = handle_robot_options(app, robot_options_and_args)
 
@@ -496,6 +916,19 @@ def handle_options(
             if settings.pythonpath:
                 sys.path = settings.pythonpath + sys.path
 
+        cache_file: Optional[Path] = None
+        manifest: Dict[str, List[int]] = {}
+        if _use_cache and _stdin_data is None:
+            cache_file = _discover_cache_file(root_folder, options, arguments)
+
+        if cache_file is not None:
+            cache = _load_discover_cache(cache_file, arguments)
+            if cache is not None:
+                app.verbose(f"Use cached discover result from '{cache_file}'.")
+                return running_model.TestSuite(rpa=cache.rpa), Collector.from_cache(cache), cache.diagnostics
+
+            manifest = _build_discover_manifest(arguments)
+
         if get_robot_version() > (6, 1):
             builder = TestSuiteBuilder(
                 included_extensions=settings.extension,
@@ -521,17 +954,40 @@ def handle_options(
                 allow_empty_suite=settings.run_empty_suite,
             )
 
-        suite = builder.build(*arguments)
+        if _can_build_in_processes(arguments):
+            suite = _build_suite_in_processes(builder, arguments)
+        else:
+            suite = builder.build(*arguments)
         settings.rpa = suite.rpa
         if settings.pre_run_modifiers:
             suite.visit(ModelModifier(settings.pre_run_modifiers, settings.run_empty_suite, LOGGER))
         suite.configure(**settings.suite_config)
 
-        collector = Collector()
+        # a cached result must contain the whole tree, it is reused by all commands
+        collector = Collector(build_tree=build_tree or cache_file is not None)
+        collector.prefetch(suite)
 
         suite.visit(collector)
 
-        return suite, collector, build_diagnostics(diagnostics_logger.messages)
+        diagnostics = build_diagnostics(diagnostics_logger.messages)
+
+        if cache_file is not None:
+            sources = {str(item.source) for item in itertools.chain(collector.suites, collector.tests) if item.source}
+            manifest.update(_build_discover_manifest((), sources))
+            _save_discover_cache(
+                cache_file,
+                DiscoverCache(
+                    cache_file.stem,
+                    manifest,
+                    bool(suite.rpa),
+                    collector.all,
+                    collector.test_tags,
+                    collector.statistics,
+                    diagnostics,
+                ),
+            )
+
+        return suite, collector, diagnostics
 
     except Information as err:
         app.echo(str(err))
@@ -593,41 +1049,43 @@ def all(
         if app.config.output_format is None or app.config.output_format == OutputFormat.TEXT:
             tests_or_tasks = "Task" if suite.rpa else "Test"
 
-            def print(item: TestItem, indent: int = 0) -> Iterable[str]:
-                type = click.style(
-                    item.type.capitalize() if item.type == "suite" else tests_or_tasks.capitalize(),
-                    fg="green",
-                )
-
-                if item.type == "test":
-                    yield "    "
-                    yield type
-                    yield click.style(f": {item.longname}", bold=True)
-                    yield click.style(
-                        f" ({item.source if full_paths else item.rel_source}"
-                        f":{item.range.start.line + 1 if item.range is not None else 1}){os.linesep}"
-                    )
-                    if show_tags and item.tags:
-                        yield click.style("        Tags:", bold=True, fg="green")
-                        yield f" {', '. join(normalize(str(tag), ignore='_') for tag in sorted(item.tags))}{os.linesep}"
-                else:
-                    yield type
-                    yield f": {item.longname}"
-                    yield click.style(f" ({item.source if full_paths else item.rel_source}){os.linesep}")
-                for child in item.children or []:
-                    yield from print(child, indent + 2)
-
-                if indent == 0:
-                    yield os.linesep
-
-                    yield click.style("Suites: ", underline=True, bold=True, fg="blue")
-                    yield f"{collector.statistics.suites}{os.linesep}"
-                    yield click.style(f"Suites with {tests_or_tasks}: ", underline=True, bold=True, fg="blue")
-                    yield f"{collector.statistics.suites_with_tests}{os.linesep}"
-                    yield click.style(f"{tests_or_tasks}: ", underline=True, bold=True, fg="blue")
-                    yield f"{collector.statistics.tests}{os.linesep}"
-
-            app.echo_via_pager(print(collector.all.children[0]))
+            def print(root: TestItem) -> Iterable[str]:
+                suite_type = click.style("Suite", fg="green")
+                test_type = click.style(tests_or_tasks.capitalize(), fg="green")
+
+                stack = [root]
+                while stack:
+                    item = stack.pop()
+
+                    if item.type == "test":
+                        yield "    "
+                        yield test_type
+                        yield click.style(f": {item.longname}", bold=True)
+                        yield click.style(
+                            f" ({item.source if full_paths else item.rel_source}"
+                            f":{item.range.start.line + 1 if item.range is not None else 1}){os.linesep}"
+                        )
+                        if show_tags and item.tags:
+                            yield click.style("        Tags:", bold=True, fg="green")
+                            yield f" {', '.join(item.tags)}{os.linesep}"
+                    else:
+                        yield suite_type
+                        yield f": {item.longname}"
+                        yield click.style(f" ({item.source if full_paths else item.rel_source}){os.linesep}")
+
+                    if item.children:
+                        stack.extend(reversed(item.children))
+
+                yield os.linesep
+
+                yield click.style("Suites: ", underline=True, bold=True, fg="blue")
+                yield f"{collector.statistics.suites}{os.linesep}"
+                yield click.style(f"Suites with {tests_or_tasks}: ", underline=True, bold=True, fg="blue")
+                yield f"{collector.statistics.suites_with_tests}{os.linesep}"
+                yield click.style(f"{tests_or_tasks}: ", underline=True, bold=True, fg="blue")
+                yield f"{collector.statistics.tests}{os.linesep}"
+
+            app.echo_via_pager(_chunked(print(collector.all.children[0])))
 
         else:
             app.print_data(ResultItem([collector.all], diagnostics), remove_defaults=True)
@@ -677,7 +1135,9 @@ def tests(
     ```
     """
 
-    suite, collector, diagnostics = handle_options(app, by_longname, exclude_by_longname, robot_options_and_args)
+    suite, collector, diagnostics = handle_options(
+        app, by_longname, exclude_by_longname, robot_options_and_args, build_tree=False
+    )
 
     if collector.all.children:
         if app.config.output_format is None or app.config.output_format == OutputFormat.TEXT:
@@ -698,10 +1158,10 @@ def tests(
                     )
                     if show_tags and item.tags:
                         yield click.style("    Tags:", bold=True, fg="green")
-                        yield f" {', '. join(normalize(str(tag), ignore='_') for tag in sorted(item.tags))}{os.linesep}"
+                        yield f" {', '.join(item.tags)}{os.linesep}"
 
             if collector.tests:
-                app.echo_via_pager(print(collector.tests))
+                app.echo_via_pager(_chunked(print(collector.tests)))
 
         else:
             app.print_data(ResultItem(collector.tests, diagnostics), remove_defaults=True)
@@ -758,13 +1218,13 @@ def suites(
                     yield click.style(f" ({item.source if full_paths else item.rel_source}){os.linesep}")
 
             if collector.suites:
-                app.echo_via_pager(print(collector.suites))
+                app.echo_via_pager(_chunked(print(collector.suites)))
 
         else:
             app.print_data(ResultItem(collector.suites, diagnostics), remove_defaults=True)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TagsResult:
     tags: Dict[str, List[TestItem]]
 
@@ -822,7 +1282,9 @@ def tags(
     ```
     """
 
-    _suite, collector, _diagnostics = handle_options(app, by_longname, exclude_by_longname, robot_options_and_args)
+    _suite, collector, _diagnostics = handle_options(
+        app, by_longname, exclude_by_longname, robot_options_and_args, build_tree=False
+    )
 
     if collector.all.children:
         if app.config.output_format is None or app.config.output_format == OutputFormat.TEXT:
@@ -842,13 +1304,13 @@ def tags(
                             )
 
             if collector.normalized_tags:
-                app.echo_via_pager(print(collector.normalized_tags if normalized else collector.tags))
+                app.echo_via_pager(_chunked(print(collector.normalized_tags if normalized else collector.tags)))
 
         else:
             app.print_data(TagsResult(collector.normalized_tags), remove_defaults=True)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Info:
     robot_version_string: str
     robot_env: Dict[str, str]
@@ -945,8 +1407,8 @@ def files(app: Application, full_paths: bool, paths: Iterable[Path]) -> None:
 
     root_folder, profile, _cmd_options = handle_robot_options(app, ())
 
-    search_paths = set(
-        (
+    search_paths = list(
+        dict.fromkeys(
             (
                 [*(app.config.default_paths if app.config.default_paths else ())]
                 if profile.paths is None
@@ -1,3 +1,4 @@
+import json
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional, Union
@@ -80,6 +81,7 @@ from robotcode.core.lsp.types import (
 )
 from robotcode.core.utils.dataclasses import (
     as_json,
+    as_json_bytes,
     from_json,
     to_camel_case,
     to_snake_case,
@@ -195,6 +197,21 @@ def test_encode_with_optional_field_and_none_as_default_value() -> None:
     assert as_json(SimpleItemWithOptionalFieldAndNoneAsDefaultValue(None)) == "{}"
 
 
+@pytest.mark.parametrize(
+    "expr",
+    [
+        SimpleItem(1, 2),
+        [SimpleItemWithOptionalFieldAndNoneAsDefaultValue(None), SimpleItemWithOptionalField(None)],
+        [EnumData.FIRST, EnumData.SECOND],
+        {1: "a", "b": {1, 2}},
+        {"a": 2**70},
+        "äöü",
+    ],
+)
+def test_as_json_bytes_should_encode_like_as_json(expr: Any) -> None:
+    assert json.loads(as_json_bytes(expr)) == json.loads(as_json(expr, compact=True))
+
+
 @pytest.mark.parametrize(
     ("expr", "type", "expected"),
     [
@@ -0,0 +1,159 @@
+from pathlib import Path
+from typing import Iterable, List, Set
+
+import pytest
+
+from robotcode.core.utils.glob_path import CompiledPatternSet, Pattern, globmatches, iter_files
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [
+        ("**/*.py", "a.py"),
+        ("**/*.py", "a/b/c.py"),
+        ("*.robot", "test.robot"),
+        ("a/*/c", "a/b/c"),
+        ("a/**/c", "a/c"),
+        ("a/**/c", "a/b/d/c"),
+        ("file?.txt", "file1.txt"),
+        ("*.{robot,resource}", "keywords.resource"),
+        ("[ab].txt", "b.txt"),
+        ("exact/path.txt", "exact/path.txt"),
+    ],
+)
+def test_globmatches_should_match(pattern: str, path: str) -> None:
+    assert globmatches(pattern, path)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [
+        ("*.py", "a/b.py"),
+        ("*.robot", "test.robot.bak"),
+        ("a/*/c", "a/b/d/c"),
+        ("file?.txt", "file12.txt"),
+        ("*.{robot,resource}", "keywords.py"),
+        ("[ab].txt", "c.txt"),
+        ("exact/path.txt", "exact/path.txt2"),
+    ],
+)
+def test_globmatches_should_not_match(pattern: str, path: str) -> None:
+    assert not globmatches(pattern, path)
+
+
+@pytest.fixture
+def file_tree(tmp_path: Path) -> Path:
+    for name in [
+        "a.robot",
+        "b.resource",
+        "c.py",
+        "sub/d.robot",
+        "sub/build/e.robot",
+        "build/f.robot",
+        "other/build",
+        ".hidden/g.robot",
+    ]:
+        file = tmp_path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.touch()
+
+    return tmp_path
+
+
+def _relative_files(root: Path, files: Iterable[Path]) -> Set[str]:
+    return {f.relative_to(root).as_posix() for f in files}
+
+
+def test_iter_files_should_filter_by_patterns(file_tree: Path) -> None:
+    assert _relative_files(file_tree, iter_files(file_tree, ["**/*.robot", "*.resource"])) == {
+        "a.robot",
+        "b.resource",
+        "sub/d.robot",
+        "sub/build/e.robot",
+        "build/f.robot",
+    }
+
+
+def test_iter_files_should_respect_ignore_patterns(file_tree: Path) -> None:
+    assert _relative_files(file_tree, iter_files(file_tree, "**/*.robot", ["build/", "sub/d.robot"])) == {
+        "a.robot",
+        "sub/build/e.robot",
+    }
+
+
+def test_iter_files_should_apply_directory_only_ignore_patterns_to_directories_only(file_tree: Path) -> None:
+    assert _relative_files(file_tree, iter_files(file_tree, ignore_patterns=["**/build/"])) == {
+        "a.robot",
+        "b.resource",
+        "c.py",
+        "sub",
+        "sub/d.robot",
+        "other",
+        "other/build",
+    }
+
+
+def test_iter_files_should_include_hidden_files_if_requested(file_tree: Path) -> None:
+    assert ".hidden/g.robot" not in _relative_files(file_tree, iter_files(file_tree))
+    assert ".hidden/g.robot" in _relative_files(file_tree, iter_files(file_tree, include_hidden=True))
+
+
+@pytest.mark.parametrize(
+    ("patterns", "path", "is_dir", "expected"),
+    [
+        (["build"], "build", False, True),
+        (["build"], "sub/build", False, False),
+        (["build/"], "build", False, False),
+        (["build/"], "build", True, True),
+        (["**/node_modules/"], "a/b/node_modules", True, True),
+        (["**/node_modules/"], "a/b/node_modules", False, False),
+        (["**/__pycache__"], "__pycache__", True, True),
+        (["**/*.pyc", "**/__pycache__"], "a/b.pyc", False, True),
+        (["**/*.pyc", "**/__pycache__"], "a/b.py", False, False),
+        (["**/docs/build/"], "docs/build", True, True),
+        (["**/docs/build/"], "a/docs/build", True, True),
+        (["**/docs/build/"], "a/mydocs/build", True, False),
+        (["**/docs/build/"], "build", True, False),
+    ],
+)
+def test_compiled_pattern_set_should_match(patterns: List[str], path: str, is_dir: bool, expected: bool) -> None:
+    pattern_set = CompiledPatternSet.from_patterns(Pattern(p) for p in patterns)
+
+    assert pattern_set.matches(path, path.rsplit("/", 1)[-1], is_dir) == expected
+
+
+def test_pattern_should_be_interned() -> None:
+    assert Pattern("**/*.robot") is Pattern("**/*.robot")
+    assert Pattern("**/*.robot") is not Pattern("**/*.resource")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [
+        ("**/*.py", "a.py"),
+        ("**/*.py", "a/b/c.py"),
+        ("**/*.py", "a/b.pyc"),
+        ("a/**", "a/b/c"),
+        ("a/**/c", "a/c"),
+        ("a/**/c", "a/b/c"),
+        ("a/**/c", "a/bc"),
+        ("*.{robot,resource}", "keywords.resource"),
+    ],
+)
+def test_hyperscan_matcher_should_match_like_re(pattern: str, path: str) -> None:
+    pytest.importorskip("hyperscan")
+
+    from robotcode.core.utils.glob_path import _compile_glob_pattern, _HyperscanMatcher
+
+    regex = _compile_glob_pattern(pattern)
+
+    assert (_HyperscanMatcher([regex.pattern]).fullmatch(path) is not None) == (regex.fullmatch(path) is not None)
+
+
+def test_well_known_patterns_should_be_precompiled() -> None:
+    from robotcode.core.utils.glob_path import _WELL_KNOWN_PATTERNS
+
+    pattern = _WELL_KNOWN_PATTERNS["**/*.robot"]
+
+    assert Pattern("**/*.robot") is pattern
+    assert pattern.re_pattern is not None
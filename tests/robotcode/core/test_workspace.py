@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from robotcode.core.uri import Uri
+from robotcode.core.workspace import Workspace, WorkspaceFolder
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Workspace:
+    return Workspace(
+        Uri.from_path(tmp_path),
+        [
+            WorkspaceFolder("root", Uri.from_path(tmp_path)),
+            WorkspaceFolder("sub", Uri.from_path(tmp_path / "sub")),
+            WorkspaceFolder("sub-other", Uri.from_path(tmp_path / "sub-other")),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("a.robot", "root"),
+        ("sub", "sub"),
+        ("sub/a.robot", "sub"),
+        ("sub/deep/a.robot", "sub"),
+        ("sub-other/a.robot", "sub-other"),
+        ("subfile.robot", "root"),
+    ],
+)
+def test_get_workspace_folder_should_return_the_innermost_folder(
+    workspace: Workspace, tmp_path: Path, path: str, expected: str
+) -> None:
+    folder = workspace.get_workspace_folder(Uri.from_path(tmp_path / path))
+
+    assert folder is not None
+    assert folder.name == expected
+
+
+def test_get_workspace_folder_should_return_none_outside_of_folders(workspace: Workspace, tmp_path: Path) -> None:
+    assert workspace.get_workspace_folder(Uri.from_path(tmp_path.parent / "outside.robot")) is None
+
+
+def test_get_workspace_folder_should_see_changed_folders(workspace: Workspace, tmp_path: Path) -> None:
+    uri = Uri.from_path(tmp_path / "new" / "a.robot")
+
+    folder: Optional[WorkspaceFolder] = workspace.get_workspace_folder(uri)
+    assert folder is not None
+    assert folder.name == "root"
+
+    workspace._workspace_folders.append(WorkspaceFolder("new", Uri.from_path(tmp_path / "new")))
+    workspace.workspace_folders_changed()
+
+    folder = workspace.get_workspace_folder(uri)
+    assert folder is not None
+    assert folder.name == "new"
+
+
+def test_get_workspace_folder_should_accept_uri_strings(workspace: Workspace, tmp_path: Path) -> None:
+    for _ in range(2):
+        folder = workspace.get_workspace_folder(str(Uri.from_path(tmp_path / "sub" / "a.robot")))
+
+        assert folder is not None
+        assert folder.name == "sub"
@@ -1,15 +1,18 @@
 import asyncio
+import json
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, cast
 
 import pytest
 
 from robotcode.core.lsp.types import MessageActionItem
-from robotcode.core.utils.dataclasses import as_dict, as_json
+from robotcode.core.utils.dataclasses import as_dict, as_json, as_json_bytes
 from robotcode.jsonrpc2.protocol import (
     JsonRPCError,
     JsonRPCErrorObject,
     JsonRPCErrors,
     JsonRPCMessage,
+    JsonRPCNotification,
     JsonRPCProtocol,
     JsonRPCRequest,
     JsonRPCResponse,
@@ -84,6 +87,28 @@ async def test_receive_a_batch_request_should_work() -> None:
     assert protocol.handled_messages == message
 
 
+@pytest.mark.asyncio
+async def test_receive_chunked_and_pipelined_messages_should_work() -> None:
+    protocol = DummyJsonRPCProtocol(None)
+
+    messages = [
+        JsonRPCRequest(id=1, method="doSomething", params={"text": "äöü" * 100}),
+        JsonRPCRequest(id=2, method="doSomething", params={}),
+    ]
+
+    data = b""
+    for m in messages:
+        json_message = as_json(m).encode("utf-8")
+        data += (
+            f"Content-Length: {len(json_message)}\r\nContent-Type: application/vscode-jsonrpc; charset=utf-8\r\n\r\n"
+        ).encode("ascii") + json_message
+
+    for i in range(0, len(data), 7):
+        await protocol.data_received_async(data[i : i + 7])
+
+    assert protocol.handled_messages == messages
+
+
 @pytest.mark.asyncio
 async def test_receive_invalid_jsonmessage_should_throw_send_an_error() -> None:
     protocol = DummyJsonRPCProtocol(None)
@@ -242,3 +267,60 @@ async def test_receive_response_with_generic_dict_should_return_unchanged() -> N
     a = r.result(10)
 
     assert a == [as_dict(MessageActionItem(title="hi there"))]
+
+
+@dataclass
+class DummyParams:
+    value: str
+    other: Optional[int] = None
+
+
+class DummyHandlers:
+    def with_var_kw(self, value: str, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def with_params(self, params: DummyParams, raw: Any = None) -> None:
+        pass
+
+    def with_positional_only(self, value: str, /, **kwargs: Any) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    ("method_name", "expected_args", "expected_kw_args"),
+    [
+        ("with_var_kw", [], {"value": "v", "other": None, "raw": 1, "params": DummyParams("v")}),
+        ("with_params", [], {"params": DummyParams("v"), "raw": 1}),
+        ("with_positional_only", ["v"], {"other": None, "raw": 1, "params": DummyParams("v")}),
+    ],
+)
+def test_convert_params_should_map_dataclass_fields_to_arguments(
+    method_name: str, expected_args: List[Any], expected_kw_args: Dict[str, Any]
+) -> None:
+    protocol = DummyJsonRPCProtocol(None)
+    method = getattr(DummyHandlers(), method_name)
+
+    # the second call reuses the cached parameter plan
+    for _ in range(2):
+        assert protocol._convert_params(method, DummyParams, {"value": "v", "raw": 1}) == (
+            expected_args,
+            expected_kw_args,
+        )
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        JsonRPCRequest(id=1, method="doSomething"),
+        JsonRPCRequest(id="an id", method="doSomething", params=[MessageActionItem(title="hi there")]),
+        JsonRPCNotification(method="doSomething", params={"a": 1}),
+        JsonRPCResponse(id=1, result=None),
+        JsonRPCResponse(id=1, result=MessageActionItem(title="hi there")),
+        JsonRPCError(id=1, error=JsonRPCErrorObject(code=1, message="test")),
+        JsonRPCError(id=None, error=JsonRPCErrorObject(code=1, message=None, data="data"), result=1),
+    ],
+)
+def test_wire_format_of_messages_should_match_as_json(message: JsonRPCMessage) -> None:
+    from robotcode.jsonrpc2.protocol import _MESSAGE_TO_WIRE
+
+    assert json.loads(as_json_bytes(_MESSAGE_TO_WIRE[type(message)](message))) == json.loads(as_json(message))
@@ -340,3 +340,18 @@ third
     del dummy
 
     assert len(document._cache) == 0
+
+
+def test_document_modified_should_compare_with_the_saved_text() -> None:
+    document = TextDocument(document_uri="file:///test.robot", language_id="robotframework", version=1, text="first")
+    assert not document.modified
+
+    document.apply_full_change(2, "changed")
+    assert document.modified
+
+    document.save(3, None)
+    assert not document.modified
+
+    document.apply_full_change(4, "first")
+    assert document.revert(None)
+    assert not document.modified
@@ -0,0 +1,59 @@
+import threading
+from types import SimpleNamespace
+from typing import Callable, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from robotcode.core.lsp.types import ConfigurationItem
+from robotcode.language_server.common.parts.workspace import Workspace
+
+
+class FailingLoop:
+    def is_closed(self) -> bool:
+        return False
+
+    def call_soon_threadsafe(self, callback: Callable[[], None]) -> None:
+        raise RuntimeError("Event loop is closed")
+
+
+class RecordingLoop:
+    def __init__(self) -> None:
+        self.callbacks: List[Callable[[], None]] = []
+
+    def is_closed(self) -> bool:
+        return False
+
+    def call_soon_threadsafe(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+
+def create_workspace(parent: SimpleNamespace) -> Workspace:
+    workspace = Workspace.__new__(Workspace)
+    workspace._parent = parent  # type: ignore[assignment]
+    workspace._configuration_requests = []
+    workspace._configuration_requests_lock = threading.Lock()
+    workspace._configuration_flush_scheduled = False
+    return workspace
+
+
+def test_configuration_request_should_schedule_a_flush_again_after_scheduling_failed() -> None:
+    send_request = MagicMock()
+    parent = SimpleNamespace(loop=FailingLoop(), send_request=send_request)
+    workspace = create_workspace(parent)
+
+    with pytest.raises(RuntimeError):
+        workspace._queue_configuration_request(ConfigurationItem(section="robotcode"))
+
+    assert not workspace._configuration_flush_scheduled
+
+    loop = RecordingLoop()
+    parent.loop = loop
+    workspace._queue_configuration_request(ConfigurationItem(section="robotcode.robot"))
+
+    assert len(loop.callbacks) == 1
+
+    loop.callbacks[0]()
+
+    send_request.assert_called_once()
+    assert [item.section for item in send_request.call_args.args[1].items] == ["robotcode", "robotcode.robot"]
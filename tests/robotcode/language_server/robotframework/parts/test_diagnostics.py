@@ -0,0 +1,168 @@
+import os
+import threading
+from concurrent.futures import CancelledError
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, List, Optional
+
+import pytest
+
+from robotcode.core.concurrent import Task, run_as_task
+from robotcode.core.lsp.types import Diagnostic, Position, Range
+from robotcode.core.text_document import TextDocument
+from robotcode.language_server.robotframework.parts import diagnostics
+from robotcode.language_server.robotframework.parts.diagnostics import RobotDiagnosticsProtocolPart
+
+
+def create_part(**parent: Any) -> RobotDiagnosticsProtocolPart:
+    part = RobotDiagnosticsProtocolPart.__new__(RobotDiagnosticsProtocolPart)
+    part._parent = SimpleNamespace(**parent)  # type: ignore[assignment]
+    part._diagnostics_cache_index = {}
+    part._diagnostics_cache_lock = threading.Lock()
+    return part
+
+
+@pytest.fixture
+def cache_part(tmp_path: Path) -> RobotDiagnosticsProtocolPart:
+    return create_part(
+        documents_cache=SimpleNamespace(
+            get_languages_for_document=lambda document: None,
+            get_document_type=lambda document: SimpleNamespace(value="general"),
+            get_imports_manager=lambda document: SimpleNamespace(diagnostics_cache_path=tmp_path),
+        )
+    )
+
+
+DIAGNOSTIC = Diagnostic(
+    range=Range(start=Position(line=0, character=0), end=Position(line=0, character=1)), message="m"
+)
+
+
+def test_diagnostics_cache_should_return_saved_diagnostics(cache_part: RobotDiagnosticsProtocolPart) -> None:
+    document = TextDocument("file:///a.robot", "*** Test Cases ***\n")
+
+    cache_part._save_cached_diagnostics(document, "tokens", [DIAGNOSTIC])
+
+    assert cache_part._load_cached_diagnostics(document, "tokens") == [DIAGNOSTIC]
+    assert cache_part._load_cached_diagnostics(document, "model") is None
+
+
+def test_diagnostics_cache_should_skip_modified_documents(
+    cache_part: RobotDiagnosticsProtocolPart, tmp_path: Path
+) -> None:
+    document = TextDocument("file:///a.robot", "*** Test Cases ***\n")
+    document.apply_full_change(2, "*** Keywords ***\n")
+
+    cache_part._save_cached_diagnostics(document, "tokens", [DIAGNOSTIC])
+
+    assert not list(tmp_path.iterdir())
+    assert cache_part._load_cached_diagnostics(document, "tokens") is None
+
+    document.save(3, None)
+    cache_part._save_cached_diagnostics(document, "tokens", [DIAGNOSTIC])
+
+    assert cache_part._load_cached_diagnostics(document, "tokens") == [DIAGNOSTIC]
+
+
+def test_diagnostics_cache_should_remove_least_recently_used_entries(
+    cache_part: RobotDiagnosticsProtocolPart, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(diagnostics, "DIAGNOSTICS_CACHE_MAX_ENTRIES", 2)
+
+    documents = [TextDocument(f"file:///{i}.robot", f"*** Test Cases ***\n# {i}\n") for i in range(3)]
+
+    cache_part._save_cached_diagnostics(documents[0], "tokens", [])
+    cache_part._save_cached_diagnostics(documents[1], "tokens", [])
+    assert cache_part._load_cached_diagnostics(documents[0], "tokens") == []
+
+    cache_part._save_cached_diagnostics(documents[2], "tokens", [])
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache_part._load_cached_diagnostics(documents[0], "tokens") == []
+    assert cache_part._load_cached_diagnostics(documents[1], "tokens") is None
+    assert cache_part._load_cached_diagnostics(documents[2], "tokens") == []
+
+
+def test_diagnostics_cache_should_index_existing_entries_once(cache_part: RobotDiagnosticsProtocolPart) -> None:
+    document = TextDocument("file:///a.robot", "*** Test Cases ***\n")
+    cache_part._save_cached_diagnostics(document, "tokens", [DIAGNOSTIC])
+
+    cache_part._diagnostics_cache_index.clear()
+
+    assert cache_part._load_cached_diagnostics(document, "tokens") == [DIAGNOSTIC]
+
+
+def test_diagnostics_cache_should_keep_the_old_entry_if_the_write_fails(
+    cache_part: RobotDiagnosticsProtocolPart, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    document = TextDocument("file:///a.robot", "*** Test Cases ***\n")
+    cache_part._save_cached_diagnostics(document, "tokens", [DIAGNOSTIC])
+
+    def fail_replace(*args: Any) -> None:
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache_part._save_cached_diagnostics(document, "tokens", [])
+
+    assert cache_part._load_cached_diagnostics(document, "tokens") == [DIAGNOSTIC]
+
+
+ITEMS_COUNT = 1000
+
+
+@dataclass(frozen=True)
+class VariableStub:
+    name: str
+    name_token: Optional[Any] = None
+
+
+def run_until_canceled(scan: Callable[[], Iterator[Diagnostic]], started: threading.Event) -> bool:
+    started.wait(10)
+    try:
+        list(scan())
+    except CancelledError:
+        return True
+
+    return False
+
+
+def cancel_on_first_lookup(tasks: List[Task[bool]], lookups: List[Any]) -> Callable[..., List[Any]]:
+    def lookup(document: TextDocument, item: Any, *args: Any) -> List[Any]:
+        if not lookups:
+            tasks[0].cancel()
+        lookups.append(item)
+        return [item]
+
+    return lookup
+
+
+@pytest.fixture
+def namespace() -> SimpleNamespace:
+    return SimpleNamespace(
+        get_library_doc=lambda: SimpleNamespace(
+            keywords={i: SimpleNamespace(name=f"kw{i}") for i in range(ITEMS_COUNT)}
+        ),
+        get_variable_references=lambda: {VariableStub(f"var{i}"): [] for i in range(ITEMS_COUNT)},
+    )
+
+
+@pytest.mark.parametrize("kind", ["keyword", "variable"])
+def test_unused_references_scan_should_stop_within_64_items_after_cancel(kind: str, namespace: SimpleNamespace) -> None:
+    tasks: List[Task[bool]] = []
+    lookups: List[Any] = []
+    lookup = cancel_on_first_lookup(tasks, lookups)
+
+    part = create_part(
+        documents_cache=SimpleNamespace(get_namespace=lambda document: namespace),
+        robot_references=SimpleNamespace(find_keyword_references=lookup, find_variable_references=lookup),
+    )
+    document = TextDocument("file:///a.robot", "")
+    scan = part._iter_unused_keyword_references if kind == "keyword" else part._iter_unused_variable_references
+
+    started = threading.Event()
+    tasks.append(run_as_task(run_until_canceled, lambda: scan(document), started))
+    started.set()
+
+    assert tasks[0].result(10)
+    assert 0 < len(lookups) <= 64
@@ -0,0 +1,111 @@
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from robotcode.core.documents_manager import DocumentsManager
+from robotcode.robot.diagnostics import imports_manager
+from robotcode.robot.diagnostics.document_cache_helper import DocumentsCacheHelper
+from robotcode.robot.diagnostics.imports_manager import (
+    ImportsManager,
+    _get_mp_context,
+    _get_worker_result,
+    _submit_to_worker,
+    _terminate_executor_processes,
+)
+from robotcode.robot.diagnostics.library_doc import LibraryDoc, get_module_spec
+
+
+def test_get_worker_result_should_terminate_a_hanging_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(imports_manager, "LOAD_LIBRARY_TIME_OUT", 0.5)
+
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
+    start = time.monotonic()
+    try:
+        with pytest.raises(FutureTimeoutError):
+            _get_worker_result(executor, executor.submit(time.sleep, 60))
+    finally:
+        executor.shutdown(wait=True)
+
+    assert time.monotonic() - start < 30
+
+
+def test_terminate_executor_processes_should_warn_without_processes(caplog: pytest.LogCaptureFixture) -> None:
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
+    executor.shutdown(wait=True)
+    del executor._processes
+
+    with caplog.at_level(logging.WARNING):
+        _terminate_executor_processes(executor)
+
+    assert "_processes" in caplog.text
+
+
+def test_worker_should_get_the_current_environment_and_python_path(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
+    try:
+        # starts the forkserver before the environment changes
+        executor.submit(os.getpid).result(30)
+    finally:
+        executor.shutdown(wait=True)
+
+    Path(tmp_path, "module_in_later_python_path.py").write_text("", "utf-8")
+    monkeypatch.setenv("ROBOTCODE_TEST_LATER_ENV", "later")
+    monkeypatch.setattr(sys, "path", [str(tmp_path), *sys.path])
+
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=_get_mp_context())
+    try:
+        assert _submit_to_worker(executor, os.getenv, "ROBOTCODE_TEST_LATER_ENV").result(30) == "later"
+        assert _submit_to_worker(executor, get_module_spec, "module_in_later_python_path").result(30) is not None
+    finally:
+        executor.shutdown(wait=True)
+
+
+class Sentinel:
+    pass
+
+
+def test_library_entry_should_not_be_evicted_once_a_namespace_references_it(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(imports_manager, "MAX_LIBRARY_ENTRIES", 2)
+    monkeypatch.setattr(imports_manager._LibrariesEntry, "get_libdoc", lambda self: cast(LibraryDoc, None))
+
+    manager = ImportsManager(
+        DocumentsManager([]),
+        None,
+        cast(DocumentsCacheHelper, None),
+        tmp_path,
+        {},
+        [],
+        None,
+        [],
+        [],
+        [],
+        [],
+        tmp_path,
+    )
+
+    base_dir = str(tmp_path)
+    manager.get_libdoc_for_library_import("BuiltIn", (), base_dir)
+    manager.get_libdoc_for_library_import("UsedLibrary", (), base_dir)
+    sentinel = Sentinel()
+    manager.get_libdoc_for_library_import("UsedLibrary", (), base_dir, sentinel=sentinel)
+
+    for i in range(5):
+        manager.get_libdoc_for_library_import(f"UnusedLibrary{i}", (), base_dir)
+
+    entries = {entry.name: entry for entry in manager._libaries.values()}
+    assert "BuiltIn" in entries
+    assert "UsedLibrary" in entries
+    assert "UnusedLibrary0" not in entries
+    assert not entries["UsedLibrary"].ignore_reference
+    assert sentinel in entries["UsedLibrary"].references
@@ -0,0 +1,21 @@
+import pickle
+
+from robotcode.robot.diagnostics.library_doc import get_library_doc
+
+
+def test_equal_keyword_arguments_should_be_shared() -> None:
+    libdoc = get_library_doc("Collections")
+
+    arguments = [a for kw in libdoc.keywords.values() for a in kw.arguments]
+    shared = {id(a) for a in arguments}
+
+    assert len(shared) < len(arguments)
+    assert len(shared) == len({(a.name, a.str_repr, a.kind, a.required) for a in arguments})
+
+
+def test_shared_keyword_arguments_should_survive_pickling() -> None:
+    libdoc = pickle.loads(pickle.dumps(get_library_doc("Collections"), pickle.HIGHEST_PROTOCOL))
+
+    arguments = [a for kw in libdoc.keywords.values() for a in kw.arguments]
+
+    assert len({id(a) for a in arguments}) < len(arguments)
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from robotcode.robot.utils.robot_path import find_file
+
+
+@pytest.fixture
+def file_tree(tmp_path: Path) -> Path:
+    for name in ["base/a.resource", "base/sub/b.resource", "python_path/c.resource"]:
+        file = tmp_path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.touch()
+
+    return tmp_path
+
+
+def test_find_file_should_find_file_relative_to_basedir(file_tree: Path) -> None:
+    assert find_file("a.resource", file_tree / "base") == str(file_tree / "base" / "a.resource")
+    assert find_file("sub/b.resource", file_tree / "base") == str(file_tree / "base" / "sub" / "b.resource")
+
+
+def test_find_file_should_find_file_relative_to_sys_path(file_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "path", [str(file_tree / "base" / "a.resource"), "", str(file_tree / "python_path")])
+
+    assert find_file("c.resource", file_tree / "base") == str(file_tree / "python_path" / "c.resource")
+
+
+def test_find_file_should_find_absolute_file(file_tree: Path) -> None:
+    assert find_file(file_tree / "base" / "a.resource", file_tree / "python_path") == str(
+        file_tree / "base" / "a.resource"
+    )
+
+
+def test_find_file_should_raise_for_missing_files(file_tree: Path) -> None:
+    from robot.errors import DataError
+
+    with pytest.raises(DataError, match=r"Resource file 'missing\.resource' does not exist"):
+        find_file("missing.resource", file_tree / "base", "Resource")
@@ -0,0 +1,127 @@
+import json
+import multiprocessing
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+from robotcode.robot.utils import get_robot_version
+
+
+def run_discover(cwd: Path, *args: str, stdin: Optional[str] = None) -> "subprocess.CompletedProcess[str]":
+    return subprocess.run(
+        [sys.executable, "-m", "robotcode.cli", "--no-color", "--verbose", "--format", "JSON", *args],
+        cwd=cwd,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+
+
+def discover_all(cwd: Path, *args: str) -> Any:
+    return json.loads(run_discover(cwd, "discover", *args).stdout)
+
+
+def child_names(item: Any) -> List[str]:
+    return [c["name"] for c in item.get("children") or []]
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "first").mkdir()
+    (tmp_path / "first" / "first.robot").write_text("*** Test Cases ***\nFirst\n    Log    first\n")
+    # a suite file robot can't decode is built as an erroneous suite if it is given as a path
+    (tmp_path / "broken.robot").write_bytes(b"*** Test Cases ***\nBroken\n    Log    \xff\xfe\n")
+
+    return tmp_path
+
+
+@pytest.mark.skipif(
+    get_robot_version() <= (6, 1) or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="parsing in processes needs robot > 6.1 and fork",
+)
+def test_discover_with_parse_jobs_should_match_the_serial_result(project: Path) -> None:
+    serial = discover_all(project, "--parse-jobs", "1", "all", "first", "broken.robot")
+    parallel = discover_all(project, "--parse-jobs", "2", "all", "first", "broken.robot")
+
+    assert parallel == serial
+    assert child_names(serial["items"][0]["children"][0]) == ["First", "Broken"]
+    assert any(uri.endswith("/broken.robot") for uri in serial["diagnostics"])
+
+
+def discover_cached(cwd: Path, *args: str, stdin: Optional[str] = None) -> Tuple[Any, bool]:
+    result = run_discover(
+        cwd, "discover", "--cache", *(["--read-from-stdin"] if stdin is not None else []), "all", *args, stdin=stdin
+    )
+
+    return json.loads(result.stdout), "Use cached discover result" in result.stderr
+
+
+def collect_test_names(item: Any) -> List[str]:
+    if item.get("type") == "test":
+        return [item["name"]]
+
+    return [name for c in item.get("children") or [] for name in collect_test_names(c)]
+
+
+def test_discover_cache_should_be_used_if_nothing_changed(project: Path) -> None:
+    first, first_cached = discover_cached(project, "first")
+    second, second_cached = discover_cached(project, "first")
+
+    assert not first_cached
+    assert second_cached
+    assert second == first
+
+
+def test_discover_cache_should_not_be_used_after_a_suite_is_edited(project: Path) -> None:
+    discover_cached(project, "first")
+
+    (project / "first" / "first.robot").write_text("*** Test Cases ***\nFirst Edited\n    Log    first\n")
+    result, cached = discover_cached(project, "first")
+
+    assert not cached
+    assert collect_test_names(result["items"][0]) == ["First Edited"]
+
+
+def test_discover_cache_should_not_be_used_after_a_subdirectory_is_added(project: Path) -> None:
+    discover_cached(project, "first")
+
+    (project / "first" / "sub").mkdir()
+    (project / "first" / "sub" / "new.robot").write_text("*** Test Cases ***\nNew\n    Log    new\n")
+    result, cached = discover_cached(project, "first")
+
+    assert not cached
+    assert sorted(collect_test_names(result["items"][0])) == ["First", "New"]
+
+
+def test_discover_cache_should_not_be_used_with_stdin_data(project: Path) -> None:
+    discover_cached(project, "first")
+    _, cached = discover_cached(project, "first")
+    assert cached
+
+    uri = (project / "first" / "first.robot").as_uri()
+    result, cached = discover_cached(
+        project, "first", stdin=json.dumps({uri: "*** Test Cases ***\nFrom Stdin\n    Log    stdin\n"})
+    )
+
+    assert not cached
+    assert collect_test_names(result["items"][0]) == ["From Stdin"]
+
+
+def test_discover_cache_should_not_be_used_with_a_prerunmodifier(project: Path) -> None:
+    (project / "modifier.py").write_text(
+        "from robot.api import SuiteVisitor\n\n\n"
+        "class modifier(SuiteVisitor):\n"
+        "    def start_test(self, test):\n"
+        "        test.name += ' Modified'\n"
+    )
+
+    discover_cached(project, "--prerunmodifier", "modifier.py", "first")
+    result, cached = discover_cached(project, "--prerunmodifier", "modifier.py", "first")
+
+    assert not cached
+    assert collect_test_names(result["items"][0]) == ["First Modified"]